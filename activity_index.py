@@ -0,0 +1,72 @@
+"""Índice de impressões digitais das atividades dos membros acompanhados"""
+from activity_matcher import activity_text
+
+
+class ActivityEntry:
+    """Último estado avaliado de um membro"""
+
+    __slots__ = ('activities', 'text_hash', 'matched', 'held')
+
+    def __init__(self, activities, text_hash, matched, held):
+        self.activities = activities  # Tupla de atividades avaliada (o discord.py troca a tupla a cada presença)
+        self.text_hash = text_hash  # Hash do texto normalizado do status personalizado
+        self.matched = matched  # frozenset dos cargos concedidos pelas regras
+        self.held = held  # frozenset dos cargos das regras que o membro tinha
+
+
+class ActivityIndex:
+    """Guarda, por (guild, membro), a impressão digital das atividades e o último veredito.
+
+    O texto normalizado só é montado quando a tupla de atividades mudou, e as
+    regras só rodam quando o hash desse texto mudou. O membro só é sincronizado
+    quando o veredito mudou ou quando os cargos dele não batem com o veredito
+    (ex.: alguém removeu o cargo à mão). Um membro sem mudanças custa uma
+    consulta ao dicionário e a checagem dos cargos, então cada passada do
+    monitor_status cresce com as mudanças, não com o número de cadastrados.
+    """
+
+    def __init__(self):
+        self._entries = {}  # (guild_id, member_id) -> ActivityEntry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def check(self, member, matcher, roles, known=None):
+        """Cargos concedidos ao membro se ele precisa de sincronização; None se nada mudou.
+
+        `known` é o último estado /clp gravado no banco: na primeira avaliação
+        (ex.: depois de reiniciar), o membro só é sincronizado se o veredito
+        diferir dele ou se os cargos não baterem.
+        """
+        activities = member.activities
+        held = frozenset(role_id for role_id in roles if member.get_role(role_id) is not None)
+        key = (member.guild.id, member.id)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            text = activity_text(activities)
+            matched = matcher.match_text(text)
+            self._entries[key] = ActivityEntry(activities, hash(text), matched, held)
+            if known is not None and known == bool(matched) and held == matched & roles.keys():
+                return None  # Mesmo estado de antes de reiniciar e os cargos já batem com ele
+            return matched
+
+        verdict_changed = False
+        if entry.activities is not activities:
+            entry.activities = activities
+            text = activity_text(activities)
+            text_hash = hash(text)
+            if text_hash != entry.text_hash:
+                # Só roda as regras quando o texto do status mudou (não a música, o jogo etc.)
+                entry.text_hash = text_hash
+                matched = matcher.match_text(text)
+                verdict_changed = matched != entry.matched
+                entry.matched = matched
+
+        entry.held = held
+        if verdict_changed or held != entry.matched & roles.keys():
+            return entry.matched
+        return None  # Mesmo veredito e os cargos já batem com ele
+
+    def discard(self, guild_id, member_id):
+        self._entries.pop((guild_id, member_id), None)
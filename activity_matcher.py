@@ -0,0 +1,98 @@
+"""Regras palavra-chave → cargo avaliadas sobre o status personalizado dos membros"""
+import logging
+import re
+
+import discord
+
+log = logging.getLogger(__name__)
+
+# Referência a grupo (\1, (?P=nome)) ou condicional ((?(1)...)) que não seja uma barra escapada
+_BACKREFERENCE = re.compile(r'(?<!\\)(?:\\\\)*\\[1-9]|\(\?P=|\(\?\(')
+
+
+class ActivityRule:
+    """Uma palavra-chave (ou expressão regular, com prefixo `re:`) que concede um cargo"""
+
+    __slots__ = ('pattern', 'role_id', 'is_regex')
+
+    def __init__(self, pattern, role_id):
+        self.is_regex = pattern.startswith('re:')
+        self.pattern = pattern[3:] if self.is_regex else pattern
+        self.role_id = role_id
+
+    def __repr__(self):
+        return f"<ActivityRule {'re:' if self.is_regex else ''}{self.pattern!r} -> {self.role_id}>"
+
+
+def parse_rules(spec, default_role_id):
+    """Ler regras no formato `palavra=cargo;re:padrão=cargo`; sem `=cargo`, usa o cargo padrão"""
+    rules = []
+    for item in spec.split(';'):
+        item = item.strip()
+        if not item:
+            continue
+        pattern, sep, role_id = item.rpartition('=')
+        if not sep or not role_id.strip().isdigit():
+            pattern, role_id = item, default_role_id
+        rules.append(ActivityRule(pattern.strip(), int(role_id)))
+    return rules
+
+
+def activity_text(activities):
+    """Texto normalizado do status personalizado (nome e estado), sem diferenciar maiúsculas"""
+    parts = []
+    for activity in activities:
+        if isinstance(activity, discord.CustomActivity):
+            for value in (activity.name, activity.state):
+                if value and value not in parts:
+                    parts.append(value)
+    return '\n'.join(parts).casefold()
+
+
+class ActivityMatcher:
+    """Regras compiladas uma a uma, com um pré-filtro combinado.
+
+    O pré-filtro junta todas as regras em uma única alternância, então a
+    presença comum (que não casa com nada) é descartada em uma só passada (em
+    C), qualquer que seja o número de regras. Só quando o pré-filtro casa é que
+    cada regra é procurada separadamente, e assim regras sobrepostas (ex.:
+    "/clp" e "/clp vip") concedem todos os seus cargos.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._compiled = []  # (regex, cargo) de cada regra válida
+        bodies = []
+        for rule in self.rules:
+            body = rule.pattern if rule.is_regex else re.escape(rule.pattern.casefold())
+            if _BACKREFERENCE.search(body):
+                # Referências a grupos mudam de número quando as regras são combinadas
+                log.error("❌ Regra de status inválida %r: referências a grupos não são suportadas", rule.pattern)
+                continue
+            try:
+                regex = re.compile(body, re.IGNORECASE)
+            except re.error as e:
+                log.error("❌ Regra de status inválida %r: %s", rule.pattern, e)
+                continue
+            self._compiled.append((regex, rule.role_id))
+            bodies.append(f'(?:{body})')
+        self.role_ids = frozenset(role_id for _, role_id in self._compiled)
+        self._prefilter = None
+        if len(bodies) > 1:
+            try:
+                self._prefilter = re.compile('|'.join(bodies), re.IGNORECASE)
+            except re.error as e:
+                # Ex.: o mesmo grupo nomeado em duas regras; sem pré-filtro, cada regra é procurada direto
+                log.warning("⚠️ Pré-filtro das regras de status desativado: %s", e)
+
+    def match_text(self, text):
+        """Cargos cujas regras casam com um texto já normalizado"""
+        if not self._compiled or not text:
+            return frozenset()
+        if self._prefilter is not None and self._prefilter.search(text) is None:
+            return frozenset()
+        return frozenset(role_id for regex, role_id in self._compiled if regex.search(text))
+
+    def match(self, activities):
+        """Cargos concedidos pelas atividades de um membro"""
+        return self.match_text(activity_text(activities))
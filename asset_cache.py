@@ -0,0 +1,240 @@
+"""Imagens dos embeds: cópia local, anexada ao envio ou hospedada pelo bot e renovada antes de expirar"""
+import asyncio
+import io
+import json
+import logging
+import math
+import os
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import aiohttp
+import discord
+
+log = logging.getLogger(__name__)
+
+# Espera antes de tentar de novo quando um upload ou uma renovação falha
+RETRY_DELAY = 300.0
+
+
+def parse_expiry(url):
+    """Instante Unix em que uma URL assinada do CDN expira (parâmetro ex=, em hexadecimal); None se não expira"""
+    try:
+        return int(parse_qs(urlsplit(url).query)['ex'][0], 16)
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+class Asset:
+    __slots__ = ('name', 'path', 'filename', 'source_url', 'data', 'url', 'expires', 'message_id', 'next_refresh')
+
+    def __init__(self, name, path, source_url, data):
+        self.name = name
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.source_url = source_url  # Anexo original (assinatura talvez vencida), usado se faltar a cópia local
+        self.data = data  # Bytes da imagem (None até a cópia local existir)
+        # Até existir uma cópia hospedada, a imagem vai anexada a cada envio (attachment://)
+        self.url = f"attachment://{self.filename}" if data is not None else None
+        self.expires = None
+        self.message_id = None  # Mensagem do canal de armazenamento que hospeda a imagem
+        self.next_refresh = 0.0
+
+
+class AssetCache:
+    """Mantém uma URL válida para cada imagem dos embeds.
+
+    Cada imagem fica em `directory`. Se o arquivo não existir, na primeira
+    execução o bot pede ao Discord uma assinatura nova para o anexo original
+    (POST /attachments/refresh-urls), baixa a imagem e salva a cópia; se nem
+    isso der certo, o erro vai para o log uma única vez e o embed fica sem
+    imagem. Sem canal de armazenamento, cada envio leva a imagem anexada e o
+    embed aponta para `attachment://`. Com o canal, cada imagem é enviada uma
+    única vez a ele e a mensagem fica registrada no banco; pouco antes de a
+    URL expirar, uma única tarefa busca a mensagem de novo e o Discord devolve
+    o anexo com uma assinatura nova. A cada URL nova o evento
+    `asset_refreshed` é disparado, e os cogs remontam os seus embeds.
+    """
+
+    def __init__(self, bot, channel_id, directory, store, refresh_margin=3600.0):
+        self.bot = bot
+        self.channel_id = channel_id
+        self.directory = directory
+        self.store = store
+        self.refresh_margin = refresh_margin
+        self.assets = {}  # nome -> Asset
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def register(self, name, filename, source_url):
+        """Registrar uma imagem (idempotente, para sobreviver a um reload do cog) e retornar a URL atual"""
+        asset = self.assets.get(name)
+        if asset is None:
+            path = os.path.join(self.directory, filename)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None  # Baixada do anexo original pela tarefa do cache
+            asset = self.assets[name] = Asset(name, path, source_url, data)
+            self._wake.set()
+        return asset.url
+
+    def url(self, name):
+        return self.assets[name].url
+
+    def files(self, name):
+        """Anexos a enviar junto com o embed: a imagem, enquanto não houver uma cópia hospedada"""
+        asset = self.assets.get(name)
+        if asset is None or asset.data is None or not asset.url.startswith('attachment://'):
+            return []
+        return [discord.File(io.BytesIO(asset.data), filename=asset.filename)]
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _seed(self, asset):
+        """Criar a cópia local a partir do anexo original, assinado de novo pelo Discord"""
+        if not asset.source_url:
+            raise RuntimeError(f"{asset.path} não existe e não há URL de origem")
+        route = discord.http.Route('POST', '/attachments/refresh-urls')
+        response = await self.bot.http.request(route, json={'attachment_urls': [asset.source_url]})
+        refreshed = [item['refreshed'] for item in response.get('refreshed_urls', []) if item.get('refreshed')]
+        if not refreshed:
+            raise RuntimeError("o Discord não renovou a URL de origem (anexo apagado?)")
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60)) as session:
+            async with session.get(refreshed[0]) as resp:
+                resp.raise_for_status()
+                data = await resp.read()
+        await asyncio.to_thread(self._write_file, asset.path, data)
+        asset.data = data
+        asset.url = f"attachment://{asset.filename}"
+        log.info("💾 Imagem %s baixada do anexo original para %s (%d bytes)", asset.name, asset.path, len(data))
+
+    @staticmethod
+    def _write_file(path, data):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    async def _load(self, asset):
+        """Mensagem e URL salvas no banco por uma execução anterior: (message_id, url), ou (None, None)"""
+        try:
+            value = await asyncio.to_thread(self.store.get_meta, f"asset:{asset.name}")
+        except Exception as e:
+            log.warning("Não foi possível ler a imagem %s do banco: %s", asset.name, e)
+            return None, None
+        if not value:
+            return None, None
+        saved = json.loads(value)
+        if saved.get('channel_id') != self.channel_id:
+            return None, None
+        return saved.get('message_id'), saved.get('url')
+
+    async def _save(self, asset):
+        value = json.dumps({'channel_id': self.channel_id, 'message_id': asset.message_id, 'url': asset.url})
+        try:
+            await asyncio.to_thread(self.store.set_meta, f"asset:{asset.name}", value)
+        except Exception as e:
+            log.warning("Não foi possível gravar a imagem %s no banco: %s", asset.name, e)
+
+    async def _refresh(self, asset):
+        """Obter uma URL nova: buscando a mensagem já enviada ou, sem ela, enviando a cópia local"""
+        channel = self.bot.get_partial_messageable(self.channel_id)
+        message = None
+        if asset.message_id:
+            try:
+                message = await channel.fetch_message(asset.message_id)
+            except discord.NotFound:
+                log.warning("⚠️ Mensagem da imagem %s foi apagada, enviando de novo", asset.name)
+                asset.message_id = None
+
+        if message is None:
+            message = await channel.send(file=discord.File(io.BytesIO(asset.data), filename=asset.filename))
+            asset.message_id = message.id
+            log.info("📤 Imagem %s enviada ao canal de armazenamento", asset.name)
+
+        if not message.attachments:
+            asset.message_id = None
+            raise RuntimeError(f"mensagem {message.id} sem anexo")
+        return message.attachments[0].url
+
+    async def _update(self, asset, now):
+        try:
+            url = await self._refresh(asset)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            asset.next_refresh = now + RETRY_DELAY
+            log.error("❌ Erro ao renovar a imagem %s: %s", asset.name, str(e) or type(e).__name__)
+            return
+
+        changed = url != asset.url
+        asset.url = url
+        asset.expires = parse_expiry(url)
+        asset.next_refresh = asset.expires - self.refresh_margin if asset.expires else math.inf
+        await self._save(asset)
+        if changed:
+            log.info("🖼️ URL da imagem %s renovada", asset.name)
+            self.bot.dispatch('asset_refreshed', asset.name, url)
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        loaded = set()
+        while True:
+            self._wake.clear()
+            now = time.time()
+            for asset in list(self.assets.values()):
+                if asset.name not in loaded:
+                    loaded.add(asset.name)
+                    if asset.data is None:
+                        try:
+                            await self._seed(asset)
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            # Uma única vez: sem a imagem não há o que anexar nem hospedar
+                            asset.next_refresh = math.inf
+                            log.error(
+                                "❌ Imagem %s indisponível: %s não existe e o anexo original não pôde ser "
+                                "baixado (%s). O embed vai sem imagem; coloque o arquivo em %s",
+                                asset.name, asset.path, str(e) or type(e).__name__, self.directory
+                            )
+                            continue
+                        self.bot.dispatch('asset_refreshed', asset.name, asset.url)
+                    if not self.channel_id:
+                        asset.next_refresh = math.inf  # Sem canal de armazenamento: vai anexada, nada a renovar
+                        continue
+                    message_id, url = await self._load(asset)
+                    asset.message_id = message_id
+                    expires = parse_expiry(url) if url else None
+                    if message_id and expires and expires - self.refresh_margin > now:
+                        # A URL salva ainda vale: usar e só agendar a renovação
+                        asset.url, asset.expires = url, expires
+                        asset.next_refresh = expires - self.refresh_margin
+                        self.bot.dispatch('asset_refreshed', asset.name, asset.url)
+                        continue
+                if asset.next_refresh <= now:
+                    # Só troca asset.url se a renovação der certo; se falhar, continua anexada
+                    await self._update(asset, now)
+
+            next_refresh = min((asset.next_refresh for asset in self.assets.values()), default=math.inf)
+            timeout = None if next_refresh == math.inf else max(0.0, next_refresh - time.time())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,92 @@
+"""Repasse de anexos em streaming com memória limitada"""
+import asyncio
+import contextlib
+import io
+import logging
+import tempfile
+
+import aiohttp
+import discord
+
+log = logging.getLogger(__name__)
+
+
+class AttachmentTooLarge(Exception):
+    """O anexo excede o tamanho máximo permitido para repasse"""
+
+    def __init__(self, filename, size, max_size):
+        self.filename = filename
+        self.size = size
+        self.max_size = max_size
+        super().__init__(f"{filename} tem {size} bytes (máximo {max_size} bytes)")
+
+
+class AttachmentRelay:
+    """Baixa anexos em blocos para um arquivo temporário "spooled".
+
+    Abaixo de spool_threshold o conteúdo fica em memória; acima disso vai para
+    o disco, de forma que o pico de memória por repasse não depende do tamanho
+    do arquivo. O número de repasses simultâneos é limitado por um semáforo.
+    """
+
+    def __init__(self, max_size, spool_threshold=1024 * 1024, max_concurrent=3, chunk_size=64 * 1024):
+        self.max_size = max_size
+        self.spool_threshold = spool_threshold
+        self.chunk_size = chunk_size
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._session = None
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def _check_size(self, anexo, size):
+        if size > self.max_size:
+            raise AttachmentTooLarge(anexo.filename, size, self.max_size)
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None, sock_read=60))
+        return self._session
+
+    async def _download(self, anexo, fp):
+        session = await self._get_session()
+        received = 0
+        async with session.get(anexo.url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(self.chunk_size):
+                received += len(chunk)
+                # O tamanho informado pelo Discord pode não bater com o conteúdo real
+                self._check_size(anexo, received)
+                fp.write(chunk)
+        return received
+
+    @contextlib.asynccontextmanager
+    async def open(self, anexo):
+        """Baixar o anexo em streaming e fornecer um discord.File pronto para envio"""
+        self._check_size(anexo, anexo.size)
+
+        async with self._semaphore:
+            spool = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+            try:
+                received = await self._download(anexo, spool)
+                spool.seek(0)
+                log.info("✅ Anexo processado: %s (%d bytes)", anexo.filename, received)
+                file = discord.File(fp=spool, filename=anexo.filename)
+                try:
+                    yield file
+                finally:
+                    file.close()  # Devolve ao spool o close original
+            finally:
+                spool.close()
+
+    async def read_bytes(self, anexo):
+        """Baixar o anexo uma única vez para reenviar o mesmo buffer a vários destinos"""
+        self._check_size(anexo, anexo.size)
+
+        async with self._semaphore:
+            buffer = io.BytesIO()
+            received = await self._download(anexo, buffer)
+            log.info("✅ Anexo processado: %s (%d bytes)", anexo.filename, received)
+            # getvalue() devolve o próprio buffer interno, sem cópia
+            return buffer.getvalue()
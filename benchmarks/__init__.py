@@ -0,0 +1 @@
+"""Benchmarks offline dos handlers do bot contra um gateway e uma API simulados (python -m benchmarks)"""
@@ -0,0 +1,64 @@
+"""Linha de comando dos benchmarks: python -m benchmarks [cenários] [--json arquivo]"""
+import argparse
+import json
+import logging
+import sys
+
+from benchmarks.fakes import FakeHTTP
+from benchmarks.scenarios import SCENARIOS, run_all
+
+COLUMNS = ('scenario', 'ops', 'seconds', 'handler_seconds', 'ops_per_sec', 'p50_ms', 'p99_ms', 'peak_kib')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument(
+        'scenarios', nargs='*', metavar='cenário', help=f"cenários: {', '.join(SCENARIOS)} (padrão: todos)"
+    )
+    parser.add_argument('--latency', type=float, default=0.05, help='latência média da API falsa, em segundos')
+    parser.add_argument('--jitter', type=float, default=0.02, help='desvio da latência, em segundos')
+    parser.add_argument('--rate-limit', type=float, default=0.02, help='probabilidade de uma chamada responder 429')
+    parser.add_argument('--members', type=int, default=10_000, help='membros da guild sintética')
+    parser.add_argument('--no-memory', action='store_true', help='não medir o pico de memória (tracemalloc deixa tudo mais lento)')
+    parser.add_argument('--json', metavar='ARQUIVO', help='gravar os resultados em JSON (para comparar no CI)')
+    parser.add_argument('--max-p99-ms', type=float, help='sair com erro se o p99 de algum cenário passar deste valor')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"cenários desconhecidos: {', '.join(unknown)} (opções: {', '.join(SCENARIOS)})")
+
+    # Os logs por operação do bot atrapalham a medição
+    logging.getLogger().setLevel(logging.WARNING)
+
+    names = args.scenarios or list(SCENARIOS)
+    overrides = {
+        'presence_churn': {'members': args.members},
+        'booster_churn': {'members': args.members},
+    }
+    results = run_all(
+        names,
+        lambda: FakeHTTP(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit),
+        memory=not args.no_memory,
+        **overrides
+    )
+
+    print('  '.join(f'{column:>14}' for column in COLUMNS))
+    for result in results:
+        print('  '.join(f'{result[column]!s:>14}' for column in COLUMNS))
+        extra = {key: value for key, value in result.items() if key not in COLUMNS}
+        print(f"{'':>14}  {extra}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.max_p99_ms is not None:
+        slow = [result['scenario'] for result in results if result['p99_ms'] > args.max_p99_ms]
+        if slow:
+            print(f"❌ p99 acima de {args.max_p99_ms} ms: {', '.join(slow)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""Objetos falsos no lugar do gateway e da API do Discord, com latência e 429 simulados"""
+import asyncio
+import random
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import discord
+
+from attachment_relay import AttachmentRelay
+from booster_index import BoosterIndex
+from config import (
+    AVS_MAX_CONCURRENT_RELAYS, AVS_MAX_FILE_SIZE, AVS_QUEUE_SIZE, AVS_SPOOL_THRESHOLD, AVS_WORKERS, BOOSTER_ROLE_ID,
+    ROLE_ID,
+)
+from guild_config import GuildConfigIndex, default_config
+from member_registry import MemberRegistry
+from role_queue import RoleOperationQueue
+from webhook_cache import WebhookCache
+from worker_pool import WorkerPool
+
+
+class FakeHTTP:
+    """Camada HTTP simulada: cada chamada espera uma latência sorteada e pode responder 429.
+
+    Como o HTTPClient do discord.py, um 429 não chega a quem chamou: a
+    requisição espera `retry_after` segundos e é repetida, até 5 tentativas.
+    Só quando todas respondem 429 o HTTPException sobe. Todas as respostas
+    429 contam em `rate_limited`, inclusive as repetidas internamente.
+    """
+
+    MAX_TRIES = 5  # Mesmo limite de tentativas do HTTPClient do discord.py
+
+    def __init__(self, latency=0.05, jitter=0.02, rate_limit=0.0, retry_after=0.1, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit  # Probabilidade de uma chamada responder 429
+        self.retry_after = retry_after  # Segundos de espera antes de repetir uma chamada que respondeu 429
+        self.random = random.Random(seed)
+        self.calls = Counter()  # rota -> chamadas
+        self.rate_limited = Counter()  # rota -> respostas 429
+        self.in_flight = 0
+
+    async def request(self, route):
+        for tries in range(self.MAX_TRIES):
+            self.calls[route] += 1
+            self.in_flight += 1
+            try:
+                await asyncio.sleep(max(0.0, self.random.gauss(self.latency, self.jitter)))
+            finally:
+                self.in_flight -= 1
+            if not self.rate_limit or self.random.random() >= self.rate_limit:
+                return
+            self.rate_limited[route] += 1
+            if tries < self.MAX_TRIES - 1:
+                await asyncio.sleep(self.retry_after)
+        raise discord.HTTPException(SimpleNamespace(status=429, reason='Too Many Requests'), 'You are being rate limited.')
+
+
+class FakeRole:
+    def __init__(self, role_id, name):
+        self.id = role_id
+        self.name = name
+
+    def is_default(self):
+        return False
+
+    def __eq__(self, other):
+        return isinstance(other, FakeRole) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeMember:
+    """Membro no cache; as alterações de cargo passam pela FakeHTTP antes de valer"""
+
+    def __init__(self, guild, member_id, activities=(), premium_since=None):
+        self.guild = guild
+        self.id = member_id
+        self.name = self.display_name = f"membro{member_id}"
+        self.activities = tuple(activities)
+        self.premium_since = premium_since
+        self._role_ids = set()
+        self.display_avatar = SimpleNamespace(url=f"https://cdn.example/avatars/{member_id}.png")
+
+    @property
+    def roles(self):
+        return [self.guild.roles[role_id] for role_id in self._role_ids]
+
+    def get_role(self, role_id):
+        return self.guild.roles.get(role_id) if role_id in self._role_ids else None
+
+    def snapshot(self):
+        """Cópia rasa do estado atual, usada como `before` nos eventos"""
+        before = FakeMember.__new__(FakeMember)
+        before.__dict__.update(self.__dict__)
+        before._role_ids = set(self._role_ids)
+        return before
+
+    async def add_roles(self, *roles, reason=None):
+        await self.guild.http.request('add_role')
+        self._role_ids.update(role.id for role in roles)
+
+    async def remove_roles(self, *roles, reason=None):
+        await self.guild.http.request('remove_role')
+        self._role_ids.difference_update(role.id for role in roles)
+
+    async def edit(self, roles, reason=None):
+        await self.guild.http.request('edit_member')
+        self._role_ids = {role.id for role in roles}
+
+
+class FakeWebhook:
+    def __init__(self, http, user):
+        self.http = http
+        self.user = user
+
+    async def send(self, wait=True, file=None, **kwargs):
+        if file is not None:
+            file.fp.read()  # Simula o upload lendo o arquivo inteiro
+        await self.http.request('execute_webhook')
+
+
+class FakeTextChannel:
+    def __init__(self, guild, channel_id):
+        self.guild = guild
+        self.id = channel_id
+        self.name = f"canal{channel_id}"
+        self.mention = f"<#{channel_id}>"
+        self._webhooks = []
+
+    async def webhooks(self):
+        await self.guild.http.request('channel_webhooks')
+        return list(self._webhooks)
+
+    async def create_webhook(self, name, reason=None):
+        await self.guild.http.request('create_webhook')
+        webhook = FakeWebhook(self.guild.http, self.guild.bot_user)
+        self._webhooks.append(webhook)
+        return webhook
+
+
+class FakeGuild:
+    """Guild sintética com N membros no cache e os cargos do bot"""
+
+    def __init__(self, guild_id, http, bot_user, members=0, clp_ratio=0.0, booster_ratio=0.0, seed=0):
+        rng = random.Random(seed)
+        self.id = guild_id
+        self.http = http
+        self.bot_user = bot_user
+        self.voice_client = None
+        self.roles = {
+            ROLE_ID: FakeRole(ROLE_ID, 'representante'),
+            BOOSTER_ROLE_ID: FakeRole(BOOSTER_ROLE_ID, 'booster'),
+        }
+        self._members = {}
+        self.channels = {}
+        for member_id in range(1, members + 1):
+            activities = (clp_activity(),) if rng.random() < clp_ratio else ()
+            premium_since = 1 if rng.random() < booster_ratio else None
+            self._members[member_id] = FakeMember(self, member_id, activities, premium_since)
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    def get_member(self, member_id):
+        return self._members.get(member_id)
+
+    def get_role(self, role_id):
+        return self.roles.get(role_id)
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def add_text_channel(self, channel_id):
+        channel = self.channels[channel_id] = FakeTextChannel(self, channel_id)
+        return channel
+
+    async def query_members(self, user_ids, limit=5, presences=True, cache=True):
+        await self.http.request('request_members')
+        return [self._members[user_id] for user_id in user_ids if user_id in self._members][:limit]
+
+
+def clp_activity(text='Entre no /clp'):
+    return discord.CustomActivity(name=text)
+
+
+class _FakeResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send_message(self, content=None, **kwargs):
+        self._interaction.responded_at = time.perf_counter()
+        self._interaction.reply = content
+
+    async def defer(self, ephemeral=False, thinking=False):
+        self._interaction.responded_at = time.perf_counter()
+
+
+class _FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        self._interaction.followup_at = time.perf_counter()
+        self._interaction.followup_text = content
+
+
+class FakeInteraction:
+    """Interação que só registra quando (e com o quê) foi respondida"""
+
+    def __init__(self, client, guild, user, channel=None):
+        self.client = client
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.channel = channel
+        self.created_at = time.perf_counter()
+        self.responded_at = None
+        self.followup_at = None
+        self.reply = None
+        self.followup_text = None
+        self.response = _FakeResponse(self)
+        self.followup = _FakeFollowup(self)
+
+
+class _NullStore:
+    def record(self, guild_id, user_id, has_clp=None):
+        pass
+
+
+class FakeBot(MemberRegistry):
+    """Substituto do DiscordBot com os mesmos componentes reais (cadastro, fila de cargos, configuração das guilds, pools)"""
+
+    def __init__(self, guilds=(), role_rate=50.0, role_burst=50):
+        self.guilds = list(guilds)
+        self.user = SimpleNamespace(id=0, name='bot')
+        self.clicked_users = {}
+        self.clp_states = {}
+        self.store = _NullStore()
+        self.guild_configs = GuildConfigIndex(default_config())
+        self.booster_index = BoosterIndex()
+        self.role_queue = RoleOperationQueue(rate=role_rate, burst=role_burst)
+        self.webhook_cache = WebhookCache()
+        self.attachment_relay = AttachmentRelay(
+            max_size=AVS_MAX_FILE_SIZE,
+            spool_threshold=AVS_SPOOL_THRESHOLD,
+            max_concurrent=AVS_MAX_CONCURRENT_RELAYS
+        )
+        self.avs_pool = WorkerPool('avs', workers=AVS_WORKERS, max_queue=AVS_QUEUE_SIZE)
+        self.last_monitor_tick = None
+
+    def start(self):
+        self.role_queue.start()
+        self.avs_pool.start()
+
+    async def stop(self):
+        await self.role_queue.stop()
+        await self.avs_pool.stop()
+        await self.attachment_relay.close()
+
+    async def wait_until_ready(self):
+        pass
+
+    def is_ready(self):
+        return True
+
+    async def drain_role_queue(self, timeout=120.0):
+        """Esperar a fila de cargos esvaziar e as requisições terminarem; retorna os segundos gastos"""
+        started = time.perf_counter()
+        while (
+            self.role_queue.depth or any(guild.http.in_flight for guild in self.guilds)
+        ) and time.perf_counter() - started < timeout:
+            await asyncio.sleep(0.01)
+        return time.perf_counter() - started
@@ -0,0 +1,157 @@
+"""Modo padrão contra o modo de alto desempenho: eventos de presença por segundo e CPU por evento.
+
+python -m benchmarks.runtime_mode [--events N] [--json arquivo]
+
+Cada evento é um PRESENCE_UPDATE serializado como chega do gateway: o
+consumidor decodifica o payload, monta as atividades e chama o
+on_presence_update real. O modo padrão é o de uma instalação só com
+requirements.txt (json da biblioteca padrão e loop do asyncio); os outros
+mostram o ganho de cada pacote do requirements-speed.txt (o orjson, que o
+discord.py usa sozinho quando instalado, e o uvloop do FAST_RUNTIME). Os
+modos sem o pacote instalado são pulados.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+
+from discord.activity import create_activity
+
+from benchmarks.fakes import FakeBot, FakeGuild, FakeHTTP
+from cogs.representante import Representante
+
+# (nome, JSON, uvloop)
+MODES = (
+    ('padrão', 'json', False),
+    ('orjson', 'orjson', False),
+    ('uvloop', 'json', True),
+    ('orjson+uvloop', 'orjson', True),
+)
+
+
+def decoder(name):
+    """Função que decodifica os payloads, como o discord.py faz com ou sem o orjson; None se não instalado"""
+    if name == 'json':
+        return json.loads
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson.loads
+
+
+def presence_payloads(count, members, seed=0):
+    """PRESENCE_UPDATEs como texto do gateway, alternando o status personalizado com e sem /clp"""
+    rng = random.Random(seed)
+    payloads = []
+    for sequence in range(count):
+        member_id = rng.randint(1, members)
+        state = "Entre no /clp" if rng.random() < 0.5 else "ouvindo música"
+        payloads.append(json.dumps({
+            'op': 0, 's': sequence, 't': 'PRESENCE_UPDATE',
+            'd': {
+                'user': {'id': str(member_id)},
+                'guild_id': '1',
+                'status': 'online',
+                'client_status': {'desktop': 'online', 'mobile': 'idle'},
+                'activities': [
+                    {'type': 4, 'name': 'Custom Status', 'state': state, 'id': 'custom', 'created_at': 1700000000000},
+                    {
+                        'type': 2, 'name': 'Spotify', 'id': 'spotify:1', 'created_at': 1700000000000,
+                        'details': 'Faixa', 'state': 'Artista', 'sync_id': '4uLU6hMCjMI75M1A2tKUQC',
+                        'session_id': 'a' * 32, 'party': {'id': 'spotify:' + str(member_id)},
+                        'assets': {'large_image': 'spotify:ab67616d0000b273', 'large_text': 'Álbum'},
+                        'timestamps': {'start': 1700000000000, 'end': 1700000200000}, 'flags': 48,
+                    },
+                ],
+            },
+        }))
+    return payloads
+
+
+async def consume(payloads, members, loads):
+    """Decodificar e despachar os eventos por uma fila, como o leitor do gateway faz"""
+    guild = FakeGuild(1, FakeHTTP(latency=0.0, jitter=0.0), None, members=members)
+    bot = FakeBot([guild])
+    bot.clicked_users[guild.id] = set(range(1, members + 1))
+    cog = Representante(bot)
+    queue = asyncio.Queue(maxsize=1000)
+
+    async def reader():
+        for payload in payloads:
+            await queue.put(payload)
+        await queue.put(None)
+
+    async def dispatcher():
+        while (payload := await queue.get()) is not None:
+            data = loads(payload)['d']
+            member = guild.get_member(int(data['user']['id']))
+            before = member.snapshot()
+            member.activities = tuple(create_activity(activity, None) for activity in data['activities'])
+            await cog.on_presence_update(before, member)
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    await asyncio.gather(reader(), dispatcher())
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def run_mode(name, json_name, fast_loop, payloads, members):
+    loads = decoder(json_name)
+    if loads is None:
+        return None
+    loop_factory = None
+    if fast_loop:
+        try:
+            import uvloop
+        except ImportError:
+            return None
+        loop_factory = uvloop.new_event_loop
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        wall, cpu = runner.run(consume(payloads, members, loads))
+    return {
+        'mode': name,
+        'json': json_name,
+        'events': len(payloads),
+        'events_per_sec': round(len(payloads) / wall, 1),
+        'cpu_us_per_event': round(cpu / len(payloads) * 1e6, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.runtime_mode', description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=50_000, help='eventos de presença por modo')
+    parser.add_argument('--members', type=int, default=5_000, help='membros cadastrados da guild sintética')
+    parser.add_argument('--json', metavar='ARQUIVO', help='gravar os resultados em JSON')
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    payloads = presence_payloads(args.events, args.members)
+
+    results = []
+    for name, json_name, fast_loop in MODES:
+        result = run_mode(name, json_name, fast_loop, payloads, args.members)
+        if result is None:
+            print(f"{name:>14}  (pulado: pacote não instalado)")
+            continue
+        results.append(result)
+
+    baseline = results[0]['cpu_us_per_event']
+    print(f"{'mode':>14}  {'events/s':>12}  {'cpu µs/evento':>14}  {'vs padrão':>10}")
+    for result in results:
+        speedup = baseline / result['cpu_us_per_event']
+        print(
+            f"{result['mode']:>14}  {result['events_per_sec']:>12}  {result['cpu_us_per_event']:>14}  {speedup:>9.2f}x"
+        )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""Cenários de carga: oscilação de presenças, tempestade de cliques, boosts e /avs"""
+import asyncio
+import random
+import time
+import tracemalloc
+
+from aiohttp import web
+
+from benchmarks.fakes import FakeBot, FakeGuild, FakeHTTP, FakeInteraction, clp_activity
+from cogs.avs import Avs
+from cogs.booster import Booster
+from cogs.representante import Representante, StatusCheckView
+
+
+class Result:
+    """Latências de um cenário e o resumo que vai para o relatório"""
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []  # Segundos por operação
+        self.extra = {}
+        self.elapsed = 0.0
+        self.window = None  # Segundos só da fase dos handlers (sem esperar a fila de cargos)
+        self.peak_memory = 0
+        self.started = None
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        ops = len(latencies)
+        # seconds inclui esperar a fila de cargos; ops_per_sec usa só a fase dos handlers (handler_seconds)
+        handler_seconds = self.window or self.elapsed
+        return {
+            'scenario': self.name,
+            'ops': ops,
+            'seconds': round(self.elapsed, 3),
+            'handler_seconds': round(handler_seconds, 3),
+            'ops_per_sec': round(ops / handler_seconds, 1) if handler_seconds else 0.0,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'peak_kib': round(self.peak_memory / 1024, 1),
+            **self.extra,
+        }
+
+
+def percentile(values, pct):
+    """Percentil de uma lista já ordenada (vizinho mais próximo)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class measure:
+    """Mede o tempo total e o pico de memória (tracemalloc) de um bloco"""
+
+    def __init__(self, result, memory=True):
+        self.result = result
+        self.memory = memory
+
+    def __enter__(self):
+        if self.memory:
+            tracemalloc.start()
+        self.result.started = time.perf_counter()
+        return self.result
+
+    def __exit__(self, *exc):
+        self.result.elapsed = time.perf_counter() - self.result.started
+        if self.memory:
+            self.result.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+def http_summary(http):
+    return {
+        'http_calls': sum(http.calls.values()),
+        'http_429': sum(http.rate_limited.values()),
+    }
+
+
+async def presence_churn(members=10_000, clicked=300, events=10_000, ticks=5, http=None, memory=True, seed=0):
+    """Presenças mudando para membros cadastrados, seguidas de execuções completas do monitor_status"""
+    http = http or FakeHTTP()
+    rng = random.Random(seed)
+    guild = FakeGuild(1, http, None, members=members, clp_ratio=0.3, seed=seed)
+    bot = FakeBot([guild])
+    bot.clicked_users[guild.id] = set(rng.sample(range(1, members + 1), clicked))
+    cog = Representante(bot)
+    bot.start()
+
+    targets = [guild.get_member(member_id) for member_id in bot.clicked_users[guild.id]]
+    with_clp = (clp_activity(),)
+
+    result = Result('presence_churn')
+    with measure(result, memory):
+        for _ in range(events):
+            member = rng.choice(targets)
+            before = member.snapshot()
+            member.activities = () if member.activities else with_clp
+            started = time.perf_counter()
+            await cog.on_presence_update(before, member)
+            result.latencies.append(time.perf_counter() - started)
+        result.window = time.perf_counter() - result.started
+        result.extra['queue_depth_after_events'] = bot.role_queue.depth
+
+        tick_latencies = []
+        for _ in range(ticks):
+            started = time.perf_counter()
+            await cog.monitor_status()
+            tick_latencies.append(time.perf_counter() - started)
+        tick_latencies.sort()
+        result.extra['monitor_tick_p50_ms'] = round(percentile(tick_latencies, 50) * 1000, 3)
+
+        result.extra['queue_drain_seconds'] = round(await bot.drain_role_queue(), 3)
+
+    result.extra.update(http_summary(http), role_ops_applied=bot.role_queue.applied, coalesced=bot.role_queue.coalesced)
+    await bot.stop()
+    return result
+
+
+async def click_storm(users=300, clicks_per_user=5, http=None, memory=True, seed=0):
+    """Centenas de usuários clicando várias vezes no botão de verificação ao mesmo tempo"""
+    http = http or FakeHTTP()
+    guild = FakeGuild(1, http, None, members=users, clp_ratio=0.7, seed=seed)
+    bot = FakeBot([guild])
+    view = StatusCheckView(bot_instance=bot)
+    button = view.children[0]
+    bot.start()
+
+    interactions = [
+        FakeInteraction(bot, guild, member)
+        for member in guild.members
+        for _ in range(clicks_per_user)
+    ]
+    random.Random(seed).shuffle(interactions)
+
+    result = Result('click_storm')
+    with measure(result, memory):
+        for interaction in interactions:
+            interaction.created_at = time.perf_counter()
+        await asyncio.gather(*(StatusCheckView.check_status(view, i, button) for i in interactions))
+        result.latencies = [i.responded_at - i.created_at for i in interactions]
+        result.window = time.perf_counter() - result.started
+        result.extra['queue_drain_seconds'] = round(await bot.drain_role_queue(), 3)
+
+    result.extra.update(
+        http_summary(http),
+        evaluations=len(interactions) - view.checks.hits - view.checks.shared,
+        deduplicated=view.checks.hits + view.checks.shared,
+    )
+    await bot.stop()
+    return result
+
+
+async def booster_churn(members=10_000, events=200, http=None, memory=True, seed=0):
+    """Boosts começando e terminando, seguidos de uma reconciliação pelo índice"""
+    http = http or FakeHTTP()
+    rng = random.Random(seed)
+    guild = FakeGuild(1, http, None, members=members, booster_ratio=0.02, seed=seed)
+    bot = FakeBot([guild])
+    cog = Booster(bot)
+    bot.start()
+
+    result = Result('booster_churn')
+    with measure(result, memory):
+        started = time.perf_counter()
+        bot.booster_index.rebuild(guild, bot.guild_configs.get(guild.id).booster_role_id)
+        result.extra['index_rebuild_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+        members_list = guild.members
+        for _ in range(events):
+            member = rng.choice(members_list)
+            before = member.snapshot()
+            member.premium_since = None if member.premium_since else 1
+            started = time.perf_counter()
+            await cog.on_member_update(before, member)
+            result.latencies.append(time.perf_counter() - started)
+        result.window = time.perf_counter() - result.started
+
+        started = time.perf_counter()
+        cog.reconcile_boosters(guild)
+        result.extra['reconcile_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        result.extra['queue_drain_seconds'] = round(await bot.drain_role_queue(), 3)
+
+    result.extra.update(http_summary(http), role_ops_applied=bot.role_queue.applied)
+    await bot.stop()
+    return result
+
+
+async def _attachment_server(size, latency):
+    """Servidor local que entrega um anexo de `size` bytes, no lugar do CDN do Discord"""
+    payload = b'x' * size
+
+    async def handler(request):
+        await asyncio.sleep(latency)
+        return web.Response(body=payload, content_type='application/octet-stream')
+
+    app = web.Application()
+    app.router.add_get('/anexo', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}/anexo"
+
+
+async def avs(requests=50, attachment_size=2 * 1024 * 1024, http=None, memory=True, seed=0):
+    """Envios do /avs com anexo: tempo até a confirmação e até a entrega pelo webhook"""
+    http = http or FakeHTTP()
+    guild = FakeGuild(1, http, None, members=requests, seed=seed)
+    bot = FakeBot([guild])
+    guild.bot_user = bot.user
+    canal = guild.add_text_channel(100)
+    cog = Avs(bot)
+    bot.start()
+    runner, url = await _attachment_server(attachment_size, http.latency)
+
+    class Attachment:
+        filename = 'anexo.bin'
+        size = attachment_size
+
+    Attachment.url = url
+    interactions = [FakeInteraction(bot, guild, member, canal) for member in guild.members]
+
+    result = Result('avs')
+    try:
+        with measure(result, memory):
+            for interaction in interactions:
+                interaction.created_at = time.perf_counter()
+            await asyncio.gather(*(
+                cog.avs_command.callback(cog, interaction, canal, "benchmark", Attachment())
+                for interaction in interactions
+            ))
+            result.latencies = [i.responded_at - i.created_at for i in interactions]
+            result.window = time.perf_counter() - result.started
+            while any(i.followup_at is None for i in interactions):
+                await asyncio.sleep(0.01)
+        delivered = sorted(i.followup_at - i.created_at for i in interactions)
+        result.extra['delivery_p50_ms'] = round(percentile(delivered, 50) * 1000, 3)
+        result.extra['delivery_p99_ms'] = round(percentile(delivered, 99) * 1000, 3)
+        result.extra['refused'] = sum(1 for i in interactions if i.followup_text and i.followup_text.startswith('⏳'))
+        result.extra.update(http_summary(http))
+    finally:
+        await bot.stop()
+        await runner.cleanup()
+    return result
+
+
+SCENARIOS = {
+    'presence_churn': presence_churn,
+    'click_storm': click_storm,
+    'booster_churn': booster_churn,
+    'avs': avs,
+}
+
+
+def run_all(names, http_factory, memory=True, **overrides):
+    """Executar os cenários em sequência, cada um com sua própria camada HTTP falsa"""
+    results = []
+    for name in names:
+        scenario = SCENARIOS[name]
+        result = asyncio.run(scenario(http=http_factory(), memory=memory, **overrides.get(name, {})))
+        results.append(result.summary())
+    return results
@@ -0,0 +1,63 @@
+"""Índice de boosters e de quem tem o cargo de booster, mantido pelos eventos de membro"""
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class BoosterIndex:
+    """IDs de quem impulsiona o servidor e de quem tem o cargo de booster, por guild.
+
+    `guild.premium_subscribers` e `role.members` percorrem todos os membros do
+    cache a cada chamada. Aqui os dois conjuntos são montados em uma única
+    passada no on_ready e depois atualizados a cada evento de membro, então a
+    diferença entre eles custa O(boosters + portadores do cargo).
+    """
+
+    def __init__(self):
+        self._role_ids = {}  # guild_id -> ID do cargo de booster
+        self._boosters = {}  # guild_id -> set(member_id)
+        self._holders = {}  # guild_id -> set(member_id)
+
+    def rebuild(self, guild, role_id):
+        """Reconstruir os conjuntos da guild em uma só passada pelo cache de membros"""
+        boosters, holders = set(), set()
+        for member in guild.members:
+            if member.premium_since is not None:
+                boosters.add(member.id)
+            if member.get_role(role_id) is not None:
+                holders.add(member.id)
+        self._role_ids[guild.id] = role_id
+        self._boosters[guild.id] = boosters
+        self._holders[guild.id] = holders
+        log.info(
+            "📇 Índice de boosters montado: %d boosters, %d com o cargo", len(boosters), len(holders),
+            extra={'guild_id': guild.id}
+        )
+
+    def update(self, member):
+        """Atualizar o membro nos dois conjuntos a partir do seu estado atual"""
+        guild_id = member.guild.id
+        if guild_id not in self._boosters:
+            return  # Guild ainda não indexada; o rebuild vai incluí-lo
+        if member.premium_since is not None:
+            self._boosters[guild_id].add(member.id)
+        else:
+            self._boosters[guild_id].discard(member.id)
+        if member.get_role(self._role_ids[guild_id]) is not None:
+            self._holders[guild_id].add(member.id)
+        else:
+            self._holders[guild_id].discard(member.id)
+
+    def discard(self, member):
+        """Remover um membro que saiu da guild"""
+        self._boosters.get(member.guild.id, set()).discard(member.id)
+        self._holders.get(member.guild.id, set()).discard(member.id)
+
+    def is_indexed(self, guild_id):
+        return guild_id in self._boosters
+
+    def diff(self, guild_id):
+        """IDs que precisam ganhar o cargo e IDs que precisam perdê-lo"""
+        boosters = self._boosters.get(guild_id, set())
+        holders = self._holders.get(guild_id, set())
+        return boosters - holders, holders - boosters
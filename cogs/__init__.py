@@ -0,0 +1 @@
+"""Extensões do bot, recarregáveis com !reload sem reconectar ao gateway"""
@@ -0,0 +1,70 @@
+"""Comandos de manutenção do dono do bot"""
+import asyncio
+import io
+import logging
+import time
+
+import discord
+from discord.ext import commands
+
+from diagnostics import format_profile, sample_stacks
+
+log = logging.getLogger(__name__)
+
+# Limite da duração de uma amostragem do !profile (segundos)
+MAX_PROFILE_SECONDS = 60
+
+
+class Admin(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name='reload')
+    @commands.is_owner()
+    async def reload_command(self, ctx, extensao: str = None):
+        """Recarregar uma extensão (ou todas) mantendo a sessão do gateway e a view persistente"""
+        started = time.monotonic()
+        if extensao:
+            names = [extensao if extensao.startswith('cogs.') else f'cogs.{extensao}']
+        else:
+            names = list(self.bot.extensions)
+
+        reloaded, failed = [], []
+        for name in names:
+            try:
+                await self.bot.reload_extension(name)
+                reloaded.append(name)
+            except commands.ExtensionError as e:
+                log.exception("❌ Erro ao recarregar %s: %s", name, e)
+                failed.append(f"{name}: {e}")
+
+        # Só envia ao Discord se a árvore de comandos mudou de fato
+        await self.bot.sync_commands()
+
+        elapsed = time.monotonic() - started
+        log.info("🔄 Extensões recarregadas por %s: %s (%.2fs)", ctx.author, ", ".join(reloaded) or "nenhuma", elapsed)
+        lines = [f"🔄 Recarregadas {len(reloaded)}/{len(names)} extensões em {elapsed:.2f}s"]
+        lines += [f"❌ {failure}"[:300] for failure in failed]
+        await ctx.reply("\n".join(lines))
+
+    @commands.command(name='profile')
+    @commands.is_owner()
+    async def profile_command(self, ctx, segundos: float = 10.0):
+        """Amostrar a pilha do loop do bot por alguns segundos e responder com as funções mais frequentes"""
+        segundos = max(1.0, min(segundos, MAX_PROFILE_SECONDS))
+        await ctx.reply(f"🩻 Amostrando o loop por {segundos:.0f}s...")
+
+        # A amostragem roda em outra thread, enquanto o loop segue atendendo eventos
+        profile = await asyncio.to_thread(sample_stacks, self.bot.loop_thread_id, segundos)
+        report = format_profile(profile, top=25)
+        log.info("🩻 Amostragem de %.0fs pedida por %s:\n%s", segundos, ctx.author, report)
+
+        summary = format_profile(profile, top=8)
+        await ctx.reply(
+            f"```\n{summary[:1900]}\n```",
+            file=discord.File(io.BytesIO(report.encode()), filename='profile.txt')
+        )
+
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
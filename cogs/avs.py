@@ -0,0 +1,262 @@
+"""Comandos /avs e /avs_multi: mensagens enviadas como webhook, com anexos"""
+import asyncio
+import contextlib
+import io
+import logging
+import re
+from typing import Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import metrics
+from attachment_relay import AttachmentTooLarge
+from config import AVS_MAX_FILE_SIZE, AVS_MULTI_CONCURRENCY, AVS_MULTI_MAX_CHANNELS
+
+log = logging.getLogger(__name__)
+
+
+def avs_send_kwargs(interaction, mensagem):
+    """Argumentos comuns de envio: nome e avatar de quem executou o comando"""
+    send_kwargs = {
+        'username': interaction.user.display_name,
+        'avatar_url': interaction.user.display_avatar.url,
+    }
+    if mensagem:
+        send_kwargs['content'] = mensagem
+    return send_kwargs
+
+
+class Avs(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def send_via_webhook(self, canal, **kwargs):
+        """Enviar pelo webhook em cache do canal, recarregando-o se tiver sido apagado"""
+        webhook = await self.bot.webhook_cache.get(canal, self.bot.user)
+        try:
+            return await webhook.send(wait=True, **kwargs)
+        except discord.NotFound:
+            log.warning("🔄 Webhook do canal %s não existe mais, recriando...", canal.name)
+            self.bot.webhook_cache.invalidate(canal.id)
+            if kwargs.get('file'):
+                kwargs['file'].reset()
+            webhook = await self.bot.webhook_cache.get(canal, self.bot.user)
+            return await webhook.send(wait=True, **kwargs)
+
+    @metrics.timed(metrics.HANDLER_DURATION.labels('avs.deliver_avs'))
+    async def deliver_avs(self, interaction, canal, mensagem, anexo):
+        """Baixar o anexo e enviar a mensagem do /avs (executado no pool de entregas)"""
+        try:
+            async with contextlib.AsyncExitStack() as stack:
+                # Preparar arquivo para envio se houver (baixado em streaming, sem cópias em memória)
+                file_to_send = None
+                if anexo:
+                    try:
+                        file_to_send = await stack.enter_async_context(self.bot.attachment_relay.open(anexo))
+                    except AttachmentTooLarge as e:
+                        log.warning("❌ Anexo grande demais: %s", e)
+                        await interaction.followup.send(
+                            f"❌ O arquivo {anexo.filename} excede o limite de {e.max_size // (1024 * 1024)} MB.",
+                            ephemeral=True
+                        )
+                        return
+                    except Exception as e:
+                        log.error("❌ Erro ao processar anexo %s: %s", anexo.filename, e)
+                        await interaction.followup.send(
+                            f"❌ Erro ao processar o arquivo {anexo.filename}: {str(e)}",
+                            ephemeral=True
+                        )
+                        return
+
+                # Enviar mensagem através do webhook do canal (em cache)
+                send_kwargs = avs_send_kwargs(interaction, mensagem)
+                if file_to_send:
+                    send_kwargs['file'] = file_to_send
+                await self.send_via_webhook(canal, **send_kwargs)
+
+            # Confirmação de sucesso
+            success_parts = [f"✅ Mensagem enviada para {canal.mention}!"]
+            if anexo:
+                success_parts.append(f"📎 Arquivo anexado: {anexo.filename}")
+
+            await interaction.followup.send(
+                "\n".join(success_parts),
+                ephemeral=True
+            )
+
+        except discord.HTTPException as e:
+            await interaction.followup.send(
+                f"❌ Erro ao enviar mensagem: {str(e)}",
+                ephemeral=True
+            )
+        except Exception as e:
+            await interaction.followup.send(
+                f"❌ Erro inesperado: {str(e)}",
+                ephemeral=True
+            )
+
+    @metrics.timed(metrics.HANDLER_DURATION.labels('avs.deliver_avs_multi'))
+    async def deliver_avs_multi(self, interaction, canais, mensagem, anexo):
+        """Baixar o anexo uma vez e enviar a mesma mensagem a vários canais (executado no pool de entregas)"""
+        file_data = None
+        if anexo:
+            try:
+                file_data = await self.bot.attachment_relay.read_bytes(anexo)
+            except AttachmentTooLarge as e:
+                log.warning("❌ Anexo grande demais: %s", e)
+                await interaction.followup.send(
+                    f"❌ O arquivo {anexo.filename} excede o limite de {e.max_size // (1024 * 1024)} MB.",
+                    ephemeral=True
+                )
+                return
+            except Exception as e:
+                log.error("❌ Erro ao processar anexo %s: %s", anexo.filename, e)
+                await interaction.followup.send(
+                    f"❌ Erro ao processar o arquivo {anexo.filename}: {str(e)}",
+                    ephemeral=True
+                )
+                return
+
+        semaphore = asyncio.Semaphore(AVS_MULTI_CONCURRENCY)
+
+        async def send_to(canal):
+            async with semaphore:
+                send_kwargs = avs_send_kwargs(interaction, mensagem)
+                if file_data is not None:
+                    # Cada envio lê o mesmo buffer; BytesIO não copia os bytes iniciais
+                    send_kwargs['file'] = discord.File(fp=io.BytesIO(file_data), filename=anexo.filename)
+                await self.send_via_webhook(canal, **send_kwargs)
+
+        results = await asyncio.gather(*(send_to(canal) for canal in canais), return_exceptions=True)
+
+        # Resumo por canal
+        summary = []
+        sent = 0
+        for canal, result in zip(canais, results):
+            if isinstance(result, Exception):
+                log.warning("❌ Falha no envio para %s: %s", canal.name, result)
+                summary.append(f"❌ {canal.mention}: {str(result)[:100]}")
+            else:
+                sent += 1
+                summary.append(f"✅ {canal.mention}")
+        header = f"📢 Mensagem enviada para {sent}/{len(canais)} canais"
+        if anexo:
+            header += f" (📎 {anexo.filename})"
+
+        report = "\n".join([header] + summary)
+        if len(report) > 2000:
+            report = report[:1997] + "..."
+        await interaction.followup.send(report, ephemeral=True)
+
+    @app_commands.command(name="avs", description="Enviar mensagem como webhook (com anexos)")
+    @app_commands.describe(
+        canal="Canal onde enviar a mensagem",
+        mensagem="Texto da mensagem (opcional se tiver anexo)",
+        anexo="Arquivo para enviar (imagem, documento, etc.)"
+    )
+    @metrics.timed(metrics.INTERACTION_LATENCY.labels('avs'))
+    async def avs_command(
+        self,
+        interaction: discord.Interaction,
+        canal: discord.TextChannel,
+        mensagem: Optional[str] = None,
+        anexo: Optional[discord.Attachment] = None
+    ):
+        """Comando /avs para enviar mensagens como webhook com anexos"""
+
+        # Verificar se há mensagem ou anexos
+        if not mensagem and not anexo:
+            await interaction.response.send_message(
+                "❌ Você precisa fornecer uma mensagem ou anexar um arquivo!",
+                ephemeral=True
+            )
+            return
+
+        if anexo and anexo.size > AVS_MAX_FILE_SIZE:
+            await interaction.response.send_message(
+                f"❌ O arquivo {anexo.filename} excede o limite de {AVS_MAX_FILE_SIZE // (1024 * 1024)} MB.",
+                ephemeral=True
+            )
+            return
+
+        # Confirmar a interação imediatamente; a entrega acontece em segundo plano
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        if not self.bot.avs_pool.submit(lambda: self.deliver_avs(interaction, canal, mensagem, anexo)):
+            log.warning("⏳ Fila do /avs cheia, pedido de %s recusado", interaction.user.name)
+            await interaction.followup.send(
+                "⏳ Muitos envios em andamento. Tente novamente em alguns instantes.",
+                ephemeral=True
+            )
+
+    @app_commands.command(name="avs_multi", description="Enviar a mesma mensagem como webhook em vários canais")
+    @app_commands.describe(
+        canais="Canais de destino (mencione com #, separados por espaço)",
+        mensagem="Texto da mensagem (opcional se tiver anexo)",
+        anexo="Arquivo para enviar (imagem, documento, etc.)"
+    )
+    @metrics.timed(metrics.INTERACTION_LATENCY.labels('avs_multi'))
+    async def avs_multi_command(
+        self,
+        interaction: discord.Interaction,
+        canais: str,
+        mensagem: Optional[str] = None,
+        anexo: Optional[discord.Attachment] = None
+    ):
+        """Comando /avs_multi: um único download do anexo reenviado a todos os canais"""
+        if not mensagem and not anexo:
+            await interaction.response.send_message(
+                "❌ Você precisa fornecer uma mensagem ou anexar um arquivo!",
+                ephemeral=True
+            )
+            return
+
+        if anexo and anexo.size > AVS_MAX_FILE_SIZE:
+            await interaction.response.send_message(
+                f"❌ O arquivo {anexo.filename} excede o limite de {AVS_MAX_FILE_SIZE // (1024 * 1024)} MB.",
+                ephemeral=True
+            )
+            return
+
+        # Resolver menções (<#id>) ou IDs, sem repetir canais
+        destinos = []
+        for channel_id in dict.fromkeys(int(m) for m in re.findall(r'\d{15,20}', canais)):
+            canal = interaction.guild.get_channel(channel_id) if interaction.guild else None
+            if isinstance(canal, discord.TextChannel):
+                destinos.append(canal)
+
+        if not destinos:
+            await interaction.response.send_message(
+                "❌ Nenhum canal de texto válido informado. Mencione os canais com #.",
+                ephemeral=True
+            )
+            return
+
+        if len(destinos) > AVS_MULTI_MAX_CHANNELS:
+            await interaction.response.send_message(
+                f"❌ No máximo {AVS_MULTI_MAX_CHANNELS} canais por envio.",
+                ephemeral=True
+            )
+            return
+
+        # Confirmar a interação imediatamente; a entrega acontece em segundo plano
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        if not self.bot.avs_pool.submit(lambda: self.deliver_avs_multi(interaction, destinos, mensagem, anexo)):
+            log.warning("⏳ Fila do /avs cheia, pedido de %s recusado", interaction.user.name)
+            await interaction.followup.send(
+                "⏳ Muitos envios em andamento. Tente novamente em alguns instantes.",
+                ephemeral=True
+            )
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('avs.on_webhooks_update'))
+    async def on_webhooks_update(self, channel):
+        """Descartar o webhook em cache quando os webhooks do canal mudarem"""
+        self.bot.webhook_cache.invalidate(channel.id)
+
+
+async def setup(bot):
+    await bot.add_cog(Avs(bot))
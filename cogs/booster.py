@@ -0,0 +1,215 @@
+"""Cargo de booster: comando /booster e atribuição automática ao impulsionar o servidor"""
+import logging
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+import metrics
+from config import BOOSTER_IMAGE_URL, BOOSTER_RECONCILE_INTERVAL, EMBED_COLOR, LEAN_MEMBER_CACHE
+
+log = logging.getLogger(__name__)
+
+# Mensagens de sistema enviadas quando alguém impulsiona o servidor
+BOOST_MESSAGE_TYPES = (
+    discord.MessageType.premium_guild_subscription,
+    discord.MessageType.premium_guild_tier_1,
+    discord.MessageType.premium_guild_tier_2,
+    discord.MessageType.premium_guild_tier_3,
+)
+
+
+class Booster(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        self.embed = self.build_embed(self.bot.assets.register('booster', 'booster.png', BOOSTER_IMAGE_URL))
+        self.reconcile_loop.start()
+
+    async def cog_unload(self):
+        self.reconcile_loop.cancel()
+
+    def build_embed(self, image_url):
+        """Embed do /booster montado uma vez e remontado só quando a URL da imagem muda"""
+        embed = discord.Embed(
+            title="<a:Nitro_boosting_level:1421543769282445433> _**BOOSTER'S**_ <a:alert_white:1421543759467774063>",
+            description=(
+                "_de boost em nossa comunidade e faça dela cada vez maior!_\n"
+                "> de cortesia você ganha o benefício:\n\n"
+                "<:gh_3BlackArrow:1421493564310945903> _**tela:**_ como booster, você garante a aquisição do cargo tela, que permite a você iniciar transmissões de tela e câmera em canais de voz.\n\n"
+                "<a:alert_white:1421543759467774063> _**importante:**_ sujeito a punição por transmissões inadequadas."
+            ),
+            color=EMBED_COLOR
+        )
+        if image_url:
+            embed.set_image(url=image_url)
+        return embed
+
+    @commands.Cog.listener()
+    async def on_asset_refreshed(self, name, url):
+        if name == 'booster':
+            self.embed = self.build_embed(url)
+
+    def booster_role_id(self, guild):
+        return self.bot.guild_configs.get(guild.id).booster_role_id
+
+    def rebuild_index(self, guild):
+        """Montar o índice de boosters da guild, se ela tiver o cargo de booster configurado"""
+        role_id = self.booster_role_id(guild)
+        if role_id and guild.get_role(role_id):
+            self.bot.booster_index.rebuild(guild, role_id)
+            return True
+        return False
+
+    def reconcile_boosters(self, guild):
+        """Aplicar pela fila de cargos só a diferença entre boosters e quem tem o cargo de booster"""
+        booster_role = guild.get_role(self.booster_role_id(guild))
+        if not booster_role:
+            log.error("❌ Cargo de booster não encontrado (ID: %s)", self.booster_role_id(guild))
+            return
+
+        to_add, to_remove = self.bot.booster_index.diff(guild.id)
+        for member_id in to_add:
+            member = guild.get_member(member_id)
+            if member:
+                self.bot.role_queue.submit(member, booster_role, True, reason="Reconciliação de boosters", source='booster_reconcile')
+        for member_id in to_remove:
+            member = guild.get_member(member_id)
+            if member:
+                self.bot.role_queue.submit(member, booster_role, False, reason="Reconciliação de boosters", source='booster_reconcile')
+
+        if to_add or to_remove:
+            log.info(
+                "🔁 Reconciliação de boosters: %d a adicionar, %d a remover", len(to_add), len(to_remove),
+                extra={'guild_id': guild.id}
+            )
+
+    @tasks.loop(hours=BOOSTER_RECONCILE_INTERVAL)
+    @metrics.timed(metrics.HANDLER_DURATION.labels('booster.reconcile_loop'))
+    async def reconcile_loop(self):
+        """Reconciliação periódica a partir do índice (sem percorrer os membros da guild)"""
+        if self.reconcile_loop.current_loop == 0:
+            return  # A primeira passada já é feita no on_ready
+        for guild in self.bot.guilds:
+            if self.bot.booster_index.is_indexed(guild.id):
+                self.reconcile_boosters(guild)
+
+    @reconcile_loop.before_loop
+    async def before_reconcile_loop(self):
+        await self.bot.wait_until_ready()
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('booster.on_ready'))
+    async def on_ready(self):
+        # Boosts que começaram ou terminaram com o bot offline
+        if LEAN_MEMBER_CACHE:
+            return  # O índice é montado quando os boosters entrarem no cache enxuto
+        for guild in self.bot.guilds:
+            if self.rebuild_index(guild):
+                self.reconcile_boosters(guild)
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('booster.on_lean_boosters_ready'))
+    async def on_lean_boosters_ready(self, guild):
+        if self.rebuild_index(guild):
+            self.reconcile_boosters(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        if not LEAN_MEMBER_CACHE and self.rebuild_index(guild):
+            self.reconcile_boosters(guild)
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('booster.on_member_join'))
+    async def on_member_join(self, member):
+        self.bot.booster_index.update(member)
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('booster.on_member_remove'))
+    async def on_member_remove(self, member):
+        self.bot.booster_index.discard(member)
+
+    @app_commands.command(name="booster", description="Enviar informações sobre boosters")
+    @app_commands.describe()
+    @metrics.timed(metrics.INTERACTION_LATENCY.labels('booster'))
+    async def booster_command(self, interaction: discord.Interaction):
+        """Comando /booster para enviar embed com informações dos boosters"""
+        channel_name = getattr(interaction.channel, 'name', 'DM') if interaction.channel else 'DM'
+        log.info("🎉 Comando /booster executado por %s no canal %s", interaction.user.name, channel_name)
+
+        # Verificar se o canal é o correto para boosters (configurado por guild)
+        booster_channel_id = self.bot.guild_configs.get(interaction.guild_id).booster_channel_id
+        if not interaction.channel or interaction.channel.id != booster_channel_id:
+            log.info("❌ Canal incorreto: %s, esperado: %s", interaction.channel.id if interaction.channel else None, booster_channel_id)
+            await interaction.response.send_message(
+                "❌ Este comando só pode ser usado em um canal específico.",
+                ephemeral=True
+            )
+            return
+
+        # Embed pré-montado; a imagem vai anexada até o bot.assets ter uma cópia hospedada
+        log.debug("📤 Enviando embed de booster...")
+        await interaction.response.send_message(embed=self.embed, files=self.bot.assets.files('booster'))
+        log.info("✅ Embed de booster enviado com sucesso!")
+
+    @commands.Cog.listener('on_message')
+    @metrics.timed(metrics.HANDLER_DURATION.labels('booster.on_boost_message'))
+    async def on_boost_message(self, message):
+        """Modo enxuto: detectar novos boosts de membros fora do cache pela mensagem de sistema"""
+        if not LEAN_MEMBER_CACHE or message.type not in BOOST_MESSAGE_TYPES:
+            return
+        if not message.guild or not isinstance(message.author, discord.Member):
+            return
+
+        booster_role = message.guild.get_role(self.booster_role_id(message.guild))
+        if booster_role and booster_role not in message.author.roles:
+            log.info("🎉 %s começou a boostar o servidor!", message.author.display_name, extra={'member_id': message.author.id})
+            self.bot.role_queue.submit(message.author, booster_role, True, reason="Membro começou a boostar", source='boost_message')
+
+        # Manter o booster no cache para perceber quando o boost terminar
+        await self.bot.cache_members(message.guild, [message.author.id])
+        self.bot.booster_index.update(message.author)
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('booster.on_member_update'))
+    async def on_member_update(self, before, after):
+        """Detectar quando alguém boostar o servidor e dar o cargo automaticamente"""
+        self.bot.booster_index.update(after)
+        try:
+            # Verificar se o membro começou a booster o servidor
+            was_booster = before.premium_since is not None
+            is_booster = after.premium_since is not None
+
+            if not was_booster and is_booster:
+                # Membro começou a booster agora
+                log.info("🎉 %s começou a boostar o servidor!", after.display_name, extra={'member_id': after.id})
+
+                # Buscar o cargo de booster
+                guild = after.guild
+                booster_role = guild.get_role(self.booster_role_id(guild))
+
+                if booster_role:
+                    # Adicionar o cargo (a fila cancela uma remoção pendente e ignora quem já tem o cargo)
+                    self.bot.role_queue.submit(after, booster_role, True, reason="Membro começou a boostar", source='on_member_update')
+                else:
+                    log.error("❌ Cargo de booster não encontrado (ID: %s)", self.booster_role_id(guild))
+
+            elif was_booster and not is_booster:
+                # Membro parou de booster
+                log.info("💔 %s parou de boostar o servidor", after.display_name, extra={'member_id': after.id})
+
+                # Buscar o cargo de booster
+                guild = after.guild
+                booster_role = guild.get_role(self.booster_role_id(guild))
+
+                if booster_role:
+                    # Remover o cargo (a fila cancela uma adição pendente e ignora quem não tem o cargo)
+                    self.bot.role_queue.submit(after, booster_role, False, reason="Membro parou de boostar", source='on_member_update')
+
+        except Exception as e:
+            log.exception("❌ Erro ao processar atualização de booster: %s", e)
+
+
+async def setup(bot):
+    await bot.add_cog(Booster(bot))
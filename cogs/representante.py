@@ -0,0 +1,293 @@
+"""Cargo de representante: comando /url, botão de verificação e monitoramento do status /clp"""
+import logging
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+import metrics
+from activity_index import ActivityIndex
+from single_flight import SingleFlight
+from config import EMBED_COLOR, LEAN_MEMBER_CACHE, REPRESENTANTE_IMAGE_URL, STATUS_CHECK_COOLDOWN
+
+log = logging.getLogger(__name__)
+member_log = logging.getLogger('bot.membros')  # Linhas repetitivas por membro (amostradas)
+
+# --- VIEW PERSISTENTE COM BOTÃO ---
+
+class StatusCheckView(discord.ui.View):
+    def __init__(self, bot_instance=None):
+        super().__init__(timeout=None)
+        self.bot_instance = bot_instance
+        # Usuários que já clicaram no botão, por guild (o mesmo dicionário do bot, persistido no banco)
+        self.clicked_users = bot_instance.clicked_users if bot_instance else {}
+        # Cliques simultâneos do mesmo usuário na mesma guild dividem uma avaliação; repetidos na janela vêm da memória
+        self.checks = SingleFlight(ttl=STATUS_CHECK_COOLDOWN)
+
+    @discord.ui.button(
+        emoji="<a:A_Tada:1418647260002254981>",
+        label="url",
+        style=discord.ButtonStyle.grey,
+        custom_id="status_check_button"
+    )
+    @metrics.timed(metrics.INTERACTION_LATENCY.labels('status_check_button'))
+    async def check_status(self, interaction: discord.Interaction, button: discord.ui.Button):
+        user = interaction.user
+        member_log.info("🔎 Usuário %s clicou no botão de verificação", user.name, extra={'member_id': user.id})
+
+        reply = await self.checks.run((interaction.guild_id, user.id), lambda: self.evaluate(interaction))
+        await interaction.response.send_message(reply, ephemeral=True)
+
+    async def evaluate(self, interaction):
+        """Verificar o status do usuário, enfileirar os cargos e retornar a resposta do botão"""
+        user = interaction.user
+        guild = interaction.guild
+
+        if not guild:
+            log.warning("❌ Guild não encontrada")
+            return "❌ Erro: Guild não encontrada."
+
+        # Adicionar usuário à lista de quem já clicou (gravado no banco em lote)
+        if self.bot_instance:
+            self.bot_instance.remember_clp_state(guild.id, user.id)
+        else:
+            self.clicked_users.setdefault(guild.id, set()).add(user.id)
+
+        # Buscar o membro para obter atividades
+        member = guild.get_member(user.id)
+        if not member and LEAN_MEMBER_CACHE:
+            # Modo enxuto: o membro só entra no cache (com presença) depois do primeiro clique
+            await interaction.client.cache_members(guild, [user.id])
+            member = guild.get_member(user.id)
+        if not member:
+            return "❌ Não foi possível encontrar suas informações. Tente novamente."
+
+        # Avaliar o status com as mesmas regras do monitoramento
+        matched = interaction.client.guild_configs.get(guild.id).matcher.match(member.activities)
+        has_clp = bool(matched)
+
+        if self.bot_instance:
+            self.bot_instance.remember_clp_state(guild.id, member.id, has_clp)
+
+        if not has_clp:
+            return (
+                "❌ **Não encontrado!**\n"
+                "Adicione **/clp** na sua barra de status personalizado e tente novamente.\n\n"
+                "**Como fazer:**\n"
+                "1. Clique no seu perfil\n"
+                "2. Defina um status personalizado\n"
+                "3. Digite **/clp** no campo de texto\n"
+                "4. Clique novamente no botão"
+            )
+
+        roles = [role for role in map(guild.get_role, matched) if role]
+        if not roles:
+            return "❌ Erro: Cargo não encontrado."
+
+        # Adicionar cargos (aplicados pela fila de cargos do bot)
+        missing = [role for role in roles if role not in member.roles]
+        if not missing:
+            return "ℹ️ Você já possui o cargo de representante!"
+        for role in missing:
+            interaction.client.role_queue.submit(member, role, True, reason="Status verificado pelo botão", source='check_status')
+        return (
+            "✅ **Parabéns!** Você recebeu o cargo de representante! 🎉\n"
+            "Agora você pode mover membros e silenciar nos canais de voz."
+        )
+
+# --- COG ---
+
+class Representante(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.status_view = StatusCheckView(bot_instance=bot)
+        # Impressões digitais das atividades; após um reload a primeira passada avalia todos de novo
+        self.activity_index = ActivityIndex()
+        self.missing_roles = set()  # (guild_id, role_id) já avisados como inexistentes
+
+    async def cog_load(self):
+        # Registrar a view persistente; após um reload ela substitui a anterior (mesmo custom_id)
+        self.bot.status_view = self.status_view
+        self.bot.add_view(self.status_view)
+        self.embed = self.build_embed(self.bot.assets.register('representante', 'representante.png', REPRESENTANTE_IMAGE_URL))
+        self.monitor_status.start()
+
+    async def cog_unload(self):
+        self.monitor_status.cancel()
+
+    def build_embed(self, image_url):
+        """Embed do /url montado uma vez e remontado só quando a URL da imagem muda"""
+        embed = discord.Embed(
+            title="<:verify:1421493602684768326> _**SEJA REPRESENTANTE**_",
+            description=(
+                "adicione a url _**/clp**_ na sua barra de status personalizado e libere os seguintes recursos:\n\n"
+                "• mover membros (mov call): permite que você transfira outros usuários entre os canais de voz.\n"
+                "• silenciar (mutar): confere a você a permissão de mutar membros nos canais de voz.\n\n"
+                "_**importante:**_ o uso indevido desses comandos resultará em punição."
+            ),
+            color=EMBED_COLOR
+        )
+        if image_url:
+            embed.set_image(url=image_url)
+        return embed
+
+    @commands.Cog.listener()
+    async def on_asset_refreshed(self, name, url):
+        if name == 'representante':
+            self.embed = self.build_embed(url)
+
+    def guild_roles(self, guild):
+        """Cargos das regras de status que existem na guild, por ID"""
+        role_ids = self.bot.guild_configs.get(guild.id).matcher.role_ids
+        roles = {role_id: role for role_id in role_ids if (role := guild.get_role(role_id))}
+        if not roles:
+            # Guild sem nenhum dos cargos (ex.: sem entrada própria e os IDs padrão são de outra guild)
+            log.debug("Guild sem os cargos das regras de status, ignorada", extra={'guild_id': guild.id})
+            return roles
+        for role_id in role_ids - roles.keys():
+            if (guild.id, role_id) not in self.missing_roles:
+                self.missing_roles.add((guild.id, role_id))
+                log.warning(
+                    "⚠️ Cargo %s das regras de status não existe nesta guild", role_id,
+                    extra={'guild_id': guild.id}
+                )
+        return roles
+
+    async def sync_clp_role(self, member, roles=None, source=None, matched=None):
+        """Adicionar ou remover os cargos das regras de status conforme o status atual do membro"""
+        if roles is None:
+            roles = self.guild_roles(member.guild)
+
+        if matched is None:
+            matched = self.bot.guild_configs.get(member.guild.id).matcher.match(member.activities)
+        has_clp = bool(matched)
+        member_log.debug(
+            "👤 %s: /clp=%s, cargos=%s", member.display_name, has_clp, sorted(matched),
+            extra={'member_id': member.id}
+        )
+        if self.bot.remember_clp_state(member.guild.id, member.id, has_clp):
+            member_log.info(
+                "🔁 Estado /clp de %s mudou para %s", member.display_name, has_clp,
+                extra={'member_id': member.id}
+            )
+
+        # Estado desejado de cada cargo, sem olhar o cache: a fila cancela uma operação oposta ainda pendente
+        for role_id, role in roles.items():
+            if role_id in matched:
+                self.bot.role_queue.submit(member, role, True, reason="Status detectado", source=source)
+            else:
+                self.bot.role_queue.submit(member, role, False, reason="Status removido", source=source)
+
+    @tasks.loop(minutes=10)  # Reconciliação lenta: as mudanças chegam em tempo real por on_presence_update
+    async def monitor_status(self):
+        """Reconciliar periodicamente o cargo dos usuários cadastrados (rede de segurança)"""
+        bot = self.bot
+        bot.last_monitor_tick = time.monotonic()
+        evaluated = 0
+        synced = 0
+        try:
+            log.info(
+                "🔄 Reconciliação ativa - Usuários cadastrados: %d | Fila de cargos: %d pendentes, %.2f op/s",
+                sum(map(len, bot.clicked_users.values())), bot.role_queue.depth, bot.role_queue.drain_rate
+            )
+
+            for guild in bot.guilds:
+                roles = self.guild_roles(guild)
+                if not roles:
+                    continue
+
+                # Buscar apenas os usuários cadastrados, sem percorrer todos os membros da guild
+                monitored_users = [
+                    member for member in map(guild.get_member, bot.registered_users(guild.id)) if member
+                ]
+                matcher = bot.guild_configs.get(guild.id).matcher
+
+                evaluated += len(monitored_users)
+                guild_synced = 0
+                for member in monitored_users:
+                    try:
+                        # Só quem mudou de status ou de cargos desde a última avaliação
+                        matched = self.activity_index.check(
+                            member, matcher, roles, bot.known_clp_state(guild.id, member.id)
+                        )
+                        if matched is None:
+                            continue
+                        guild_synced += 1
+                        await self.sync_clp_role(member, roles, source='monitor_status', matched=matched)
+                    except Exception as member_error:
+                        log.error("❌ Erro ao processar %s: %s", member.display_name, member_error)
+                synced += guild_synced
+                log.info(
+                    "📋 Reconciliados %d de %d usuários nesta guild (os demais não mudaram)",
+                    guild_synced, len(monitored_users), extra={'guild_id': guild.id}
+                )
+
+        except Exception as e:
+            log.exception("❌ Erro geral no monitoramento: %s", e)
+        finally:
+            metrics.MONITOR_TICK_DURATION.observe(time.monotonic() - bot.last_monitor_tick)
+            metrics.MONITOR_MEMBERS_EVALUATED.set(evaluated)
+            metrics.MONITOR_MEMBERS_SYNCED.set(synced)
+
+    @monitor_status.before_loop
+    async def before_monitor_status(self):
+        await self.bot.wait_until_ready()
+
+    @app_commands.command(name="url", description="Enviar informações sobre representante")
+    @app_commands.describe()
+    @metrics.timed(metrics.INTERACTION_LATENCY.labels('url'))
+    async def url_command(self, interaction: discord.Interaction):
+        """Comando /url para enviar embed com informações do representante"""
+        channel_name = getattr(interaction.channel, 'name', 'DM') if interaction.channel else 'DM'
+        log.info("Comando /url executado por %s no canal %s", interaction.user.name, channel_name)
+
+        # Verificar se o canal é o correto (configurado por guild)
+        specific_channel_id = self.bot.guild_configs.get(interaction.guild_id).specific_channel_id
+        if not interaction.channel or interaction.channel.id != specific_channel_id:
+            log.info("❌ Canal incorreto: %s, esperado: %s", interaction.channel.id if interaction.channel else None, specific_channel_id)
+            await interaction.response.send_message(
+                "❌ Este comando só pode ser usado em um canal específico.",
+                ephemeral=True
+            )
+            return
+
+        # Embed pré-montado (imagem anexada até o bot.assets ter uma cópia hospedada) e view persistente desta extensão
+        log.debug("📤 Enviando embed com botão...")
+        await interaction.response.send_message(
+            embed=self.embed, view=self.status_view, files=self.bot.assets.files('representante')
+        )
+        log.info("✅ Embed enviado com sucesso!")
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('representante.on_member_remove'))
+    async def on_member_remove(self, member):
+        # Sem isso a impressão digital (e a tupla de atividades) de quem saiu ficaria no índice para sempre
+        self.activity_index.discard(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('representante.on_presence_update'))
+    async def on_presence_update(self, before, after):
+        """Atualizar o cargo de representante assim que o status de um usuário cadastrado mudar"""
+        if not self.bot.is_registered(after.guild.id, after.id):
+            return
+
+        # Ignorar atualizações que não mexem nas atividades (ex.: só online/ausente)
+        if before.activities == after.activities:
+            return
+
+        try:
+            roles = self.guild_roles(after.guild)
+            matched = self.activity_index.check(
+                after, self.bot.guild_configs.get(after.guild.id).matcher, roles,
+                self.bot.known_clp_state(after.guild.id, after.id)
+            )
+            if matched is None:
+                return  # Mudou algo fora do status personalizado (ex.: música ou jogo)
+            await self.sync_clp_role(after, roles, source='on_presence_update', matched=matched)
+        except Exception as e:
+            log.error("❌ Erro ao atualizar cargo de %s: %s", after.display_name, e)
+
+
+async def setup(bot):
+    await bot.add_cog(Representante(bot))
@@ -0,0 +1,72 @@
+"""Presença do bot no canal de voz e reconexão automática"""
+import logging
+
+import discord
+from discord.ext import commands
+
+import metrics
+from config import VOICE_BACKOFF_BASE, VOICE_BACKOFF_MAX, VOICE_PROBE_INTERVAL
+from voice_supervisor import VoiceSupervisor
+
+log = logging.getLogger(__name__)
+
+
+class Voz(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.supervisors = {}  # guild_id -> VoiceSupervisor
+
+    def ensure_supervisors(self):
+        """Um supervisor por guild que tem um canal de voz configurado (e visível para este shard)"""
+        for guild in self.bot.guilds:
+            if guild.id in self.supervisors:
+                continue
+            channel_id = self.bot.guild_configs.get(guild.id).voice_channel_id
+            if not channel_id or not isinstance(guild.get_channel(channel_id), discord.VoiceChannel):
+                continue
+            supervisor = self.supervisors[guild.id] = VoiceSupervisor(
+                self.bot,
+                channel_id,
+                base_delay=VOICE_BACKOFF_BASE,
+                max_delay=VOICE_BACKOFF_MAX,
+                probe_interval=VOICE_PROBE_INTERVAL
+            )
+            supervisor.start()
+            log.info("🎧 Supervisor de voz iniciado para o canal %s", channel_id, extra={'guild_id': guild.id})
+
+    async def cog_load(self):
+        # Após um reload as guilds já estão no cache e os supervisores assumem as conexões existentes
+        if self.bot.is_ready():
+            self.ensure_supervisors()
+
+    async def cog_unload(self):
+        for supervisor in self.supervisors.values():
+            await supervisor.stop()
+        self.supervisors.clear()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Só cria o que falta e acorda os supervisores: um on_ready repetido não abre uma segunda conexão
+        self.ensure_supervisors()
+        for supervisor in self.supervisors.values():
+            supervisor.wake()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.ensure_supervisors()
+
+    @commands.Cog.listener()
+    @metrics.timed(metrics.HANDLER_DURATION.labels('voz.on_voice_state_update'))
+    async def on_voice_state_update(self, member, before, after):
+        """Verificar a conexão assim que o estado de voz do bot mudar"""
+        if self.bot.user and member.id == self.bot.user.id and before.channel != after.channel:
+            supervisor = self.supervisors.get(member.guild.id)
+            if supervisor is None:
+                return
+            if after.channel is None:
+                log.warning("🔌 Bot desconectado do canal de voz", extra={'guild_id': member.guild.id})
+            supervisor.wake()
+
+
+async def setup(bot):
+    await bot.add_cog(Voz(bot))
@@ -0,0 +1,95 @@
+"""Configurações do bot: IDs do servidor e ajustes lidos das variáveis de ambiente"""
+import os
+
+from dotenv import load_dotenv
+
+# Carregar variáveis de ambiente
+load_dotenv()
+
+
+def _parse_shard_ids(value):
+    """Ler "0-3" ou "0,2,4" como lista de shards; vazio = todos os shards"""
+    shard_ids = []
+    for part in filter(None, (p.strip() for p in value.split(','))):
+        start, sep, end = part.partition('-')
+        shard_ids.extend(range(int(start), int(end) + 1) if sep else [int(start)])
+    return shard_ids or None
+
+
+# --- CONFIGURAÇÕES DO BOT ---
+# IDs padrão (variáveis de ambiente), usados pelas guilds sem entrada em GUILD_CONFIG_PATH
+SPECIFIC_CHANNEL_ID = int(os.environ.get('SPECIFIC_CHANNEL_ID', 1421251054032392222))
+VOICE_CHANNEL_ID = int(os.environ.get('VOICE_CHANNEL_ID', 1421364668546683083))
+ROLE_ID = int(os.environ.get('ROLE_ID', 1421277379149697135))
+BOOSTER_CHANNEL_ID = int(os.environ.get('BOOSTER_CHANNEL_ID', 1421251143085850678))
+BOOSTER_ROLE_ID = int(os.environ.get('BOOSTER_ROLE_ID', 1421277205878673518))
+# Arquivo JSON com a configuração de cada guild: {"id_da_guild": {"role_id": ..., "voice_channel_id": ...}}
+GUILD_CONFIG_PATH = os.environ.get('GUILD_CONFIG_PATH', 'guilds.json')
+# Shards: SHARD_COUNT é o total; SHARD_IDS ("0-3" ou "0,2,4") os shards deste processo (exige SHARD_COUNT).
+# Sem os dois, automático
+SHARD_COUNT = int(os.environ.get('SHARD_COUNT') or 0) or None
+SHARD_IDS = _parse_shard_ids(os.environ.get('SHARD_IDS', ''))
+if SHARD_IDS and not SHARD_COUNT:
+    raise ValueError("SHARD_IDS exige SHARD_COUNT (total de shards entre todos os processos)")
+if SHARD_IDS and max(SHARD_IDS) >= SHARD_COUNT:
+    raise ValueError(f"SHARD_IDS fora do intervalo 0-{SHARD_COUNT - 1}: {SHARD_IDS}")
+# Regras de status personalizado → cargo, separadas por ";": "palavra=ID_DO_CARGO" ou "re:padrão=ID_DO_CARGO"
+# (sem "=ID", vale ROLE_ID). Padrão: quem tem /clp no status recebe o cargo de representante
+ACTIVITY_RULES = os.environ.get('ACTIVITY_RULES', '/clp')
+# Banco SQLite com os usuários cadastrados (use um disco persistente no Render)
+CLP_DB_PATH = os.environ.get('CLP_DB_PATH', 'data/clp.sqlite3')
+CLP_DB_FLUSH_INTERVAL = float(os.environ.get('CLP_DB_FLUSH_INTERVAL', 5))  # Segundos entre gravações em lote
+# Sincronização dos comandos slash:
+#   auto   - só sincroniza quando o hash da árvore de comandos mudar (padrão)
+#   always - sincroniza em toda inicialização
+#   never  - não sincroniza
+#   guild  - sincroniza apenas na guild DEV_GUILD_ID (propagação instantânea, para desenvolvimento)
+COMMAND_SYNC = os.environ.get('COMMAND_SYNC', 'auto').lower()
+DEV_GUILD_ID = int(os.environ.get('DEV_GUILD_ID') or 0) or None
+# Porta do servidor HTTP de saúde (o Render define PORT)
+HTTP_PORT = int(os.environ.get('PORT', 10000))
+# Diário append-only (JSONL) das alterações de cargo: arquivo, intervalo das gravações em lote (segundos),
+# tamanho para rotacionar (bytes) e quantos arquivos antigos manter
+ROLE_JOURNAL_PATH = os.environ.get('ROLE_JOURNAL_PATH', 'data/roles.jsonl')
+ROLE_JOURNAL_FLUSH_INTERVAL = float(os.environ.get('ROLE_JOURNAL_FLUSH_INTERVAL', 2))
+ROLE_JOURNAL_MAX_BYTES = int(os.environ.get('ROLE_JOURNAL_MAX_BYTES', 16 * 1024 * 1024))
+ROLE_JOURNAL_BACKUPS = int(os.environ.get('ROLE_JOURNAL_BACKUPS', 5))
+# Limite da fila de cargos: a rota de cargos de membro é limitada por guild
+ROLE_QUEUE_RATE = float(os.environ.get('ROLE_QUEUE_RATE', 1.0))  # Requisições por segundo
+ROLE_QUEUE_BURST = int(os.environ.get('ROLE_QUEUE_BURST', 10))  # Rajada máxima
+WEBHOOK_CACHE_SIZE = int(os.environ.get('WEBHOOK_CACHE_SIZE', 128))  # Canais com webhook em cache
+# Repasse de anexos do /avs: acima do limiar o arquivo vai para o disco em vez da memória
+AVS_MAX_FILE_SIZE = int(os.environ.get('AVS_MAX_FILE_SIZE', 25 * 1024 * 1024))  # Bytes
+AVS_SPOOL_THRESHOLD = int(os.environ.get('AVS_SPOOL_THRESHOLD', 1024 * 1024))  # Bytes
+AVS_MAX_CONCURRENT_RELAYS = int(os.environ.get('AVS_MAX_CONCURRENT_RELAYS', 3))
+# Pool de entregas do /avs: a interação é confirmada na hora e o envio roda em segundo plano
+AVS_WORKERS = int(os.environ.get('AVS_WORKERS', 3))
+AVS_QUEUE_SIZE = int(os.environ.get('AVS_QUEUE_SIZE', 20))
+# /avs_multi: limite de canais por envio e de envios simultâneos
+AVS_MULTI_MAX_CHANNELS = int(os.environ.get('AVS_MULTI_MAX_CHANNELS', 25))
+AVS_MULTI_CONCURRENCY = int(os.environ.get('AVS_MULTI_CONCURRENCY', 5))
+EMBED_COLOR = 0x020405
+# Anexos originais das imagens dos embeds. São URLs assinadas do CDN (ex=/hm=) que expiram: se faltar a cópia
+# local em ASSET_DIR, o bot pede ao Discord uma assinatura nova e baixa a imagem uma vez (asset_cache.py)
+REPRESENTANTE_IMAGE_URL = "https://cdn.discordapp.com/attachments/1421290562480377938/1422016814791135354/IMG_0360.png?ex=68db23dc&is=68d9d25c&hm=82169629688754bfd6e564149f4138c16fcba30f943f240fcec1e311bfcc808f&"
+BOOSTER_IMAGE_URL = "https://cdn.discordapp.com/attachments/1421290562480377938/1421846847315775660/IMG_0338.png?ex=68da8591&is=68d93411&hm=118088607c687b31d239cf9449e80ca25f00f91d263fbcc3d1c6122197796fd2&"
+# Imagens dos embeds: pasta das cópias locais (representante.png, booster.png), canal onde o bot as hospeda
+# (sem ele, vão anexadas a cada envio) e antecedência (segundos) da renovação das URLs hospedadas
+ASSET_CHANNEL_ID = int(os.environ.get('ASSET_CHANNEL_ID') or 0) or None
+ASSET_DIR = os.environ.get('ASSET_DIR', 'assets')
+ASSET_REFRESH_MARGIN = float(os.environ.get('ASSET_REFRESH_MARGIN', 3600))
+# Janela (segundos) em que cliques repetidos no botão de verificação são respondidos da memória
+STATUS_CHECK_COOLDOWN = float(os.environ.get('STATUS_CHECK_COOLDOWN', 5))
+# Supervisor de voz: backoff exponencial (segundos) entre tentativas e intervalo da verificação de saúde
+VOICE_BACKOFF_BASE = float(os.environ.get('VOICE_BACKOFF_BASE', 1))
+VOICE_BACKOFF_MAX = float(os.environ.get('VOICE_BACKOFF_MAX', 60))
+VOICE_PROBE_INTERVAL = float(os.environ.get('VOICE_PROBE_INTERVAL', 30))
+# Intervalo (em horas) da reconciliação periódica do cargo de booster; também roda a cada on_ready
+BOOSTER_RECONCILE_INTERVAL = float(os.environ.get('BOOSTER_RECONCILE_INTERVAL', 6))
+# Modo enxuto: não guardar todos os membros/presenças, só os que o bot acompanha
+LEAN_MEMBER_CACHE = os.environ.get('LEAN_MEMBER_CACHE', 'false').lower() in ('1', 'true', 'yes')
+# Diagnóstico (opt-in): detecção de callbacks que seguram o loop por mais de SLOW_CALLBACK_THRESHOLD segundos
+DIAGNOSTICS = os.environ.get('DIAGNOSTICS', 'false').lower() in ('1', 'true', 'yes')
+SLOW_CALLBACK_THRESHOLD = float(os.environ.get('SLOW_CALLBACK_THRESHOLD', 0.25))
+# Modo de alto desempenho (opt-in): loop uvloop, se instalado (requirements-speed.txt)
+FAST_RUNTIME = os.environ.get('FAST_RUNTIME', 'false').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,151 @@
+"""Diagnóstico do loop asyncio: detecção de callbacks lentos e amostragem de pilhas sob demanda"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+# Funções em que o loop está só esperando eventos (não contam como trabalho do bot)
+IDLE_FUNCTIONS = frozenset({'select', 'poll', 'epoll', '_run_once', 'run_forever'})
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _stack(frame, limit=None):
+    """Pilha do callback em execução, da função mais externa para a mais interna (sem a maquinaria do loop)"""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == '_run' and code.co_filename.endswith(os.path.join('asyncio', 'events.py')):
+            break  # Handle._run: daqui para cima é só o loop
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels[-limit:] if limit else labels
+
+
+def _task_name(loop):
+    """Nome da tarefa que o loop está executando agora (ex.: "discord.py: on_presence_update")"""
+    try:
+        task = asyncio.current_task(loop)
+    except RuntimeError:
+        return None
+    return task.get_name() if task else None
+
+
+class LoopWatchdog:
+    """Detecta callbacks que seguram o loop por mais de `threshold` segundos.
+
+    Uma tarefa no loop atualiza um batimento a cada `interval` segundos. Uma
+    thread separada confere o batimento; se ele atrasar além do limite, ela
+    captura a pilha da thread do loop (sys._current_frames) e o nome da tarefa
+    em execução enquanto o bloqueio ainda acontece. Quando o loop volta, a
+    própria tarefa registra o bloqueio com a duração, a tarefa e a pilha.
+    """
+
+    def __init__(self, threshold=0.25, interval=0.05, stack_depth=12):
+        self.threshold = threshold
+        self.interval = interval
+        self.stack_depth = stack_depth
+        self._beat = time.monotonic()
+        self._capture = None  # (nome da tarefa, pilha) do bloqueio em andamento
+        self._loop = None
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Iniciar a partir do loop do bot"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._thread.start()
+        log.info("🩻 Detecção de callbacks lentos ativa (limite de %.0f ms)", self.threshold * 1000)
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            started = time.monotonic()
+            self._beat = started
+            await asyncio.sleep(self.interval)
+            blocked = time.monotonic() - started - self.interval
+            if blocked > self.threshold:
+                self._report(blocked)
+
+    def _report(self, blocked):
+        metrics.SLOW_CALLBACKS.inc()
+        capture, self._capture = self._capture, None
+        if capture is None:
+            # A thread não chegou a ver o bloqueio (ficou abaixo do intervalo de verificação)
+            log.warning("🐢 Loop bloqueado por %.0f ms", blocked * 1000)
+            return
+        task_name, stack = capture
+        log.warning(
+            "🐢 Loop bloqueado por %.0f ms na tarefa %s:\n  %s",
+            blocked * 1000, task_name or "(callback sem tarefa)", "\n  ".join(stack),
+            extra={'handler': task_name}
+        )
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            if self._capture is not None or time.monotonic() - self._beat < self.threshold + self.interval:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._capture = (_task_name(self._loop), _stack(frame, self.stack_depth))
+
+
+def sample_stacks(thread_id, duration, interval=0.005):
+    """Amostrar a pilha de uma thread por `duration` segundos (bloqueante, rode fora do loop)"""
+    own = Counter()  # Função no topo da pilha (tempo próprio)
+    cumulative = Counter()  # Função em qualquer ponto da pilha
+    samples = idle = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        samples += 1
+        stack = None if frame.f_code.co_name in IDLE_FUNCTIONS else _stack(frame)
+        if stack:
+            own[stack[-1]] += 1
+            cumulative.update(set(stack))
+        else:
+            idle += 1
+        time.sleep(interval)
+    return {'samples': samples, 'idle': idle, 'own': own, 'cumulative': cumulative}
+
+
+def format_profile(profile, top=10):
+    """Resumo em texto das funções mais frequentes de uma amostragem"""
+    samples = profile['samples'] or 1
+    lines = [f"{profile['samples']} amostras, loop ocioso em {100 * profile['idle'] / samples:.0f}%"]
+    for title, counter in (("Tempo próprio", profile['own']), ("Tempo acumulado", profile['cumulative'])):
+        lines.append(f"\n{title}:")
+        for label, count in counter.most_common(top):
+            lines.append(f"{100 * count / samples:5.1f}%  {label}")
+    return "\n".join(lines)
@@ -0,0 +1,106 @@
+"""Configuração por guild: canais, cargos e regras de status indexados pelo ID da guild"""
+import json
+import logging
+import os
+
+from activity_matcher import ActivityMatcher, parse_rules
+from config import (
+    ACTIVITY_RULES, BOOSTER_CHANNEL_ID, BOOSTER_ROLE_ID, ROLE_ID, SPECIFIC_CHANNEL_ID, VOICE_CHANNEL_ID,
+)
+
+log = logging.getLogger(__name__)
+
+# Campos aceitos em cada entrada do arquivo de configuração
+FIELDS = ('specific_channel_id', 'voice_channel_id', 'role_id', 'booster_channel_id', 'booster_role_id', 'activity_rules')
+
+
+class GuildConfig:
+    """IDs usados pelo bot em uma guild, com as regras de status já compiladas"""
+
+    __slots__ = FIELDS + ('guild_id', 'matcher')
+
+    def __init__(self, guild_id=None, specific_channel_id=None, voice_channel_id=None, role_id=None,
+                 booster_channel_id=None, booster_role_id=None, activity_rules='/clp'):
+        self.guild_id = guild_id
+        self.specific_channel_id = specific_channel_id
+        self.voice_channel_id = voice_channel_id
+        self.role_id = role_id
+        self.booster_channel_id = booster_channel_id
+        self.booster_role_id = booster_role_id
+        self.activity_rules = activity_rules
+        self.matcher = ActivityMatcher(parse_rules(activity_rules, role_id))
+
+    def with_overrides(self, guild_id, **overrides):
+        """Nova configuração para uma guild: os campos ausentes vêm desta"""
+        values = {field: getattr(self, field) for field in FIELDS}
+        values.update(overrides)
+        return GuildConfig(guild_id, **values)
+
+    @property
+    def tracked_role_ids(self):
+        """Cargos que o bot administra nesta guild (regras de status e booster)"""
+        role_ids = set(self.matcher.role_ids)
+        if self.booster_role_id:
+            role_ids.add(self.booster_role_id)
+        return role_ids
+
+
+def default_config():
+    """Configuração das variáveis de ambiente, usada pelas guilds sem entrada própria"""
+    return GuildConfig(
+        specific_channel_id=SPECIFIC_CHANNEL_ID,
+        voice_channel_id=VOICE_CHANNEL_ID,
+        role_id=ROLE_ID,
+        booster_channel_id=BOOSTER_CHANNEL_ID,
+        booster_role_id=BOOSTER_ROLE_ID,
+        activity_rules=ACTIVITY_RULES,
+    )
+
+
+class GuildConfigIndex:
+    """Configurações por guild em memória, consultadas em O(1) pelo ID da guild.
+
+    Guilds sem entrada usam a configuração padrão. Como IDs de canal e de cargo
+    são únicos no Discord, a configuração padrão só tem efeito na guild a que
+    esses IDs pertencem.
+    """
+
+    def __init__(self, default, configs=()):
+        self.default = default
+        self._configs = {config.guild_id: config for config in configs}
+
+    def __len__(self):
+        return len(self._configs)
+
+    def __contains__(self, guild_id):
+        return guild_id in self._configs
+
+    def get(self, guild_id):
+        return self._configs.get(guild_id, self.default)
+
+    @classmethod
+    def load(cls, path, default):
+        """Ler `{"id_da_guild": {"role_id": ..., ...}}` de um arquivo JSON; sem arquivo, só a configuração padrão"""
+        if not path or not os.path.exists(path):
+            return cls(default)
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            log.error("❌ Erro ao ler a configuração das guilds em %s: %s", path, e)
+            return cls(default)
+
+        configs = []
+        for guild_id, entry in entries.items():
+            unknown = set(entry) - set(FIELDS)
+            if unknown:
+                log.warning("⚠️ Campos desconhecidos na configuração da guild %s: %s", guild_id, ", ".join(sorted(unknown)))
+            overrides = {
+                field: value if field == 'activity_rules' or value is None else int(value)
+                for field, value in entry.items() if field in FIELDS
+            }
+            configs.append(default.with_overrides(int(guild_id), **overrides))
+
+        log.info("📇 Configuração carregada para %d guilds de %s", len(configs), path)
+        return cls(default, configs)
@@ -0,0 +1,73 @@
+"""Servidor HTTP de saúde rodando no próprio loop asyncio do bot"""
+import logging
+import math
+import time
+
+from aiohttp import web
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+
+class HealthServer:
+    """Responde à verificação de porta do Render e expõe o estado real do bot"""
+
+    def __init__(self, bot, host='0.0.0.0', port=10000, monitor_stale_after=1200):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.monitor_stale_after = monitor_stale_after  # Segundos sem tick do monitor_status
+        self.app = web.Application()
+        self.app.router.add_get('/', self.handle_root)
+        self.app.router.add_get('/health', self.handle_health)
+        self.app.router.add_get('/metrics', self.handle_metrics)
+        self._runner = None
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        log.info("✅ Servidor HTTP iniciado na porta %s", self.port)
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def snapshot(self):
+        """Estado atual do bot para o /health"""
+        bot = self.bot
+        latency = bot.latency
+        gateway_connected = bot.is_ready() and not bot.is_closed() and math.isfinite(latency)
+
+        voice_connected = any(
+            vc.is_connected() for vc in bot.voice_clients
+        )
+
+        last_tick = getattr(bot, 'last_monitor_tick', None)
+        since_tick = time.monotonic() - last_tick if last_tick is not None else None
+        monitor_ok = since_tick is None or since_tick < self.monitor_stale_after
+
+        return {
+            'status': 'healthy' if gateway_connected and monitor_ok else 'unhealthy',
+            'gateway_connected': gateway_connected,
+            'latency_ms': round(latency * 1000, 1) if math.isfinite(latency) else None,
+            'voice_connected': voice_connected,
+            'seconds_since_monitor_tick': round(since_tick, 1) if since_tick is not None else None,
+            'role_queue_depth': bot.role_queue.depth,
+        }
+
+    async def handle_root(self, request):
+        return web.json_response({'status': 'Bot Discord rodando!', 'message': 'Conectado e funcionando'})
+
+    async def handle_health(self, request):
+        state = self.snapshot()
+        return web.json_response(state, status=200 if state['status'] == 'healthy' else 503)
+
+    async def handle_metrics(self, request):
+        return web.Response(
+            body=metrics.REGISTRY.render().encode('utf-8'),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+        )
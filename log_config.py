@@ -0,0 +1,99 @@
+"""Configuração de logging: saída estruturada fora do loop e amostragem de linhas repetitivas"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+# Atributos padrão de LogRecord; o resto veio de extra= e vai para o JSON
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos passados em extra="""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que mantém o traceback fora da mensagem, para o JSON separar os campos"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Deixa passar no máximo `burst` registros por mensagem a cada `window` segundos.
+
+    A chave é a string de formato crua (record.msg), então todas as linhas
+    "por membro" de um mesmo tipo dividem a mesma cota e o volume em regime
+    permanente não cresce com o número de membros. O próximo registro aceito
+    informa quantos foram descartados.
+    """
+
+    def __init__(self, burst=5, window=60.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._state = {}  # msg -> [início da janela, aceitos, descartados]
+
+    def filter(self, record):
+        now = time.monotonic()
+        state = self._state.get(record.msg)
+        if state is None or now - state[0] >= self.window:
+            suppressed = state[2] if state else 0
+            self._state[record.msg] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+        if state[1] < self.burst:
+            state[1] += 1
+            return True
+        state[2] += 1
+        return False
+
+
+def setup_logging(level='INFO', fmt='json', sample_burst=5, sample_window=60.0):
+    """Enviar todos os logs por uma fila; a escrita no stdout acontece em uma thread própria"""
+    handler = logging.StreamHandler(sys.stdout)
+    if fmt == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.handlers = [_QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    # Linhas por membro: amostradas para não crescer com o tamanho do servidor
+    logging.getLogger('bot.membros').addFilter(RateLimitFilter(sample_burst, sample_window))
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
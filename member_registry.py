@@ -0,0 +1,59 @@
+"""Cadastro do /clp por guild e cache dos membros acompanhados, compartilhados pelo bot e pelos benchmarks"""
+import asyncio
+import logging
+
+from store import LEGACY_GUILD_ID
+
+log = logging.getLogger(__name__)
+
+
+class MemberRegistry:
+    """Mixin com o cadastro do /clp: quem clicou no botão em cada guild e o último estado /clp de cada um.
+
+    Quem usa precisa ter `clicked_users` (guild_id -> IDs), `clp_states`
+    ((guild_id, user_id) -> bool) e `store` (com `record`). Cadastros antigos,
+    sem guild, ficam na guild LEGACY_GUILD_ID e valem em todas.
+    """
+
+    def registered_users(self, guild_id):
+        """IDs dos usuários cadastrados na guild, incluindo os cadastros antigos (sem guild)"""
+        return self.clicked_users.get(guild_id, set()) | self.clicked_users.get(LEGACY_GUILD_ID, set())
+
+    def is_registered(self, guild_id, user_id):
+        """O usuário está cadastrado na guild (ou tem um cadastro antigo, sem guild)?"""
+        return (
+            user_id in self.clicked_users.get(guild_id, ())
+            or user_id in self.clicked_users.get(LEGACY_GUILD_ID, ())
+        )
+
+    def known_clp_state(self, guild_id, user_id):
+        """Último estado /clp gravado do usuário na guild (ou do cadastro antigo, sem guild); None se nunca avaliado"""
+        state = self.clp_states.get((guild_id, user_id))
+        return self.clp_states.get((LEGACY_GUILD_ID, user_id)) if state is None else state
+
+    def remember_clp_state(self, guild_id, user_id, has_clp=None):
+        """Registrar o usuário como cadastrado na guild e guardar seu último estado /clp; retorna True se o estado mudou"""
+        users = self.clicked_users.setdefault(guild_id, set())
+        new_user = user_id not in users
+        users.add(user_id)
+
+        key = (guild_id, user_id)
+        changed = has_clp is not None and self.clp_states.get(key) != has_clp
+        if changed:
+            self.clp_states[key] = has_clp
+        if changed or new_user:
+            self.store.record(guild_id, user_id, has_clp)
+        return changed
+
+    async def cache_members(self, guild, user_ids):
+        """Trazer para o cache, com presença, apenas os membros indicados que ainda não estão nele"""
+        missing = [user_id for user_id in user_ids if guild.get_member(user_id) is None]
+        # O gateway aceita até 100 IDs por requisição de membros
+        for i in range(0, len(missing), 100):
+            chunk = missing[i:i + 100]
+            try:
+                # limit é o máximo de membros devolvidos (padrão 5), não o de IDs pedidos
+                await guild.query_members(user_ids=chunk, limit=len(chunk), presences=True, cache=True)
+            except asyncio.TimeoutError:
+                log.warning("⏱️ Timeout ao buscar membros da guild %s", guild.id)
+        return len(missing)
@@ -0,0 +1,252 @@
+"""Métricas do bot no formato de texto do Prometheus.
+
+Tudo roda no loop asyncio (uma única thread), então os contadores são simples
+atributos inteiros: sem locks e sem formatar strings por evento. Métricas com
+rótulos criam os filhos uma vez (labels()) e o caminho quente guarda a
+referência ao filho já resolvido.
+"""
+import asyncio
+import functools
+import logging
+import math
+import time
+from bisect import bisect_left
+
+# Buckets em segundos, do tempo de uma chamada local ao de um upload grande
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return 'NaN'
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=''):
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value):
+        self.value = value
+
+    def set_function(self, function):
+        """Ler o valor na hora da coleta em vez de atualizá-lo a cada evento"""
+        self.function = function
+
+    def get(self):
+        if self.function is not None:
+            try:
+                return self.function()
+            except Exception:
+                return float('nan')
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Último = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Filho para uma combinação de rótulos; guarde o retorno no caminho quente"""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def collect(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.kind}'
+        for values, child in self._children.items():
+            yield from self._collect_child(values, child)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default.value += amount
+
+    def _collect_child(self, values, child):
+        yield f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}'
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default.value = value
+
+    def set_function(self, function):
+        self._default.set_function(function)
+
+    def _collect_child(self, values, child):
+        yield f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}'
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def _collect_child(self, values, child):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), child.counts):
+            cumulative += count
+            le = f'le="{_format_value(float(bound))}"'
+            yield f'{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}'
+        labels = _format_labels(self.labelnames, values)
+        yield f'{self.name}_sum{labels} {_format_value(child.sum)}'
+        yield f'{self.name}_count{labels} {child.count}'
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# --- MÉTRICAS DO BOT ---
+
+INTERACTION_LATENCY = Histogram(
+    'bot_interaction_duration_seconds', 'Tempo de tratamento das interações', ('command',)
+)
+ROLE_OPERATIONS = Counter(
+    'bot_role_operations_total', 'Alterações de cargo aplicadas pela fila', ('action', 'result')
+)
+HANDLER_DURATION = Histogram('bot_handler_duration_seconds', 'Duração dos handlers de eventos e tarefas', ('handler',))
+SLOW_CALLBACKS = Counter('bot_slow_callbacks_total', 'Vezes em que um callback segurou o loop além do limite')
+HTTP_RATE_LIMITED = Counter('bot_http_429_total', 'Respostas 429 recebidas da API do Discord')
+MONITOR_TICK_DURATION = Histogram('bot_monitor_tick_seconds', 'Duração de cada execução do monitor_status')
+MONITOR_MEMBERS_EVALUATED = Gauge(
+    'bot_monitor_members_evaluated', 'Membros avaliados na última execução do monitor_status'
+)
+MONITOR_MEMBERS_SYNCED = Gauge(
+    'bot_monitor_members_synced', 'Membros que mudaram e foram sincronizados na última execução do monitor_status'
+)
+EVENT_LOOP_LAG = Gauge('bot_event_loop_lag_seconds', 'Atraso medido do loop asyncio')
+GATEWAY_LATENCY = Gauge('bot_gateway_latency_seconds', 'Latência do heartbeat do gateway')
+VOICE_RECONNECT_ATTEMPTS = Counter('bot_voice_reconnect_attempts_total', 'Tentativas de reconexão ao canal de voz')
+VOICE_RECOVERY_SECONDS = Histogram(
+    'bot_voice_recovery_seconds', 'Tempo entre perder a conexão de voz e voltar ao canal',
+    buckets=(1, 2, 5, 10, 30, 60, 120, 300, 600)
+)
+VOICE_CONNECTED = Gauge('bot_voice_connected', '1 se o bot está no canal de voz configurado', ('channel_id',))
+ROLE_QUEUE_DEPTH = Gauge('bot_role_queue_depth', 'Operações de cargo aguardando na fila')
+AVS_QUEUE_DEPTH = Gauge('bot_avs_queue_depth', 'Entregas do /avs aguardando um worker')
+
+# Filhos resolvidos uma única vez para o caminho quente
+ROLE_ADD_OK = ROLE_OPERATIONS.labels('add', 'ok')
+ROLE_ADD_FAILED = ROLE_OPERATIONS.labels('add', 'failed')
+ROLE_REMOVE_OK = ROLE_OPERATIONS.labels('remove', 'ok')
+ROLE_REMOVE_FAILED = ROLE_OPERATIONS.labels('remove', 'failed')
+
+
+def timed(histogram):
+    """Decorator que registra a duração de um handler assíncrono no histograma (ou filho) dado"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class RateLimitCounter(logging.Handler):
+    """Conta os 429 a partir dos avisos que o discord.py registra ao ser limitado"""
+
+    PREFIXES = ('We are being rate limited.', 'Webhook ID %s is rate limited.')
+
+    def __init__(self, counter=HTTP_RATE_LIMITED):
+        super().__init__(level=logging.WARNING)
+        self.counter = counter
+
+    def emit(self, record):
+        # Compara a string de formato crua, sem formatar a mensagem
+        if isinstance(record.msg, str) and record.msg.startswith(self.PREFIXES):
+            self.counter.inc()
+
+
+async def measure_loop_lag(gauge=EVENT_LOOP_LAG, interval=0.5):
+    """Medir continuamente quanto o loop atrasa para acordar uma tarefa agendada"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        gauge.set(max(0.0, loop.time() - start - interval))
@@ -0,0 +1,192 @@
+"""Diário append-only (JSONL) das alterações de cargo, gravado em lote fora do loop do bot.
+
+Consulta: python -m role_journal holders --role ID --at 2026-10-18T12:00 [--guild ID] [--path data/roles.jsonl]
+          python -m role_journal history --member ID [--path data/roles.jsonl]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+
+class RoleJournal:
+    """Registra cada alteração de cargo aplicada: instante, guild, membro, cargo, ação, motivo e origem.
+
+    append() só guarda a entrada em memória, então nunca bloqueia o loop. Uma
+    tarefa periódica grava o lote acumulado em uma thread, com fsync ao final
+    de cada lote. Quando o arquivo passa de `max_bytes`, ele é renomeado para
+    `.1` (os anteriores para `.2`, `.3`...) e os mais antigos que `backups`
+    são apagados.
+    """
+
+    def __init__(self, path, flush_interval=2.0, max_bytes=16 * 1024 * 1024, backups=5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._pending = []  # Linhas JSON aguardando a próxima gravação
+        self._write_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        self._task = None
+        self.written = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Parar a tarefa periódica sem interromper uma gravação em andamento e gravar o que sobrou"""
+        if self._task:
+            # Sem cancel(): cancelar no meio do to_thread devolveria o lock com a gravação ainda em curso
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def append(self, action, guild_id, member_id, role_id, reason=None, source=None):
+        """Registrar uma alteração para a próxima gravação em lote (não faz E/S)"""
+        self._pending.append(json.dumps({
+            'ts': round(time.time(), 3),
+            'guild': guild_id,
+            'member': member_id,
+            'role': role_id,
+            'action': action,
+            'reason': reason,
+            'source': source,
+        }, ensure_ascii=False, separators=(',', ':')))
+
+    async def flush(self):
+        if not self._pending:
+            return
+        async with self._write_lock:
+            batch, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._write, batch)
+                self.written += len(batch)
+            except OSError as e:
+                log.error("❌ Erro ao gravar %d entradas no diário de cargos: %s", len(batch), e)
+                # Devolver o lote na frente das entradas novas, preservando a ordem
+                self._pending[:0] = batch
+
+    def _write(self, batch):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(batch) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        log.info("🗂️ Diário de cargos rotacionado: %s", self.path)
+
+    async def _flush_loop(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                await self.flush()
+
+
+def journal_files(path):
+    """Arquivos do diário do mais antigo (maior sufixo) ao atual"""
+    backups = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        backups.append(f"{path}.{index}")
+        index += 1
+    files = list(reversed(backups))
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def iter_records(path):
+    """Entradas do diário em ordem cronológica (linhas corrompidas, como a última de uma queda, são ignoradas)"""
+    for file_path in journal_files(path):
+        with open(file_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def holders_at(path, role_id, at, guild_id=None):
+    """IDs dos membros com o cargo no instante `at` (Unix), reconstruídos pelas alterações até lá"""
+    holders = set()
+    for record in iter_records(path):
+        if record['ts'] > at:
+            break
+        if record['role'] != role_id or (guild_id is not None and record['guild'] != guild_id):
+            continue
+        if record['action'] == 'add':
+            holders.add(record['member'])
+        else:
+            holders.discard(record['member'])
+    return holders
+
+
+def _parse_time(value):
+    """Instante Unix a partir de um número ou de uma data ISO 8601 (sem fuso = horário local)"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def main(argv=None):
+    from config import ROLE_ID, ROLE_JOURNAL_PATH
+
+    parser = argparse.ArgumentParser(prog='python -m role_journal', description="Consultas ao diário de cargos")
+    parser.add_argument('--path', default=ROLE_JOURNAL_PATH, help='arquivo do diário')
+    commands = parser.add_subparsers(dest='command', required=True)
+    holders = commands.add_parser('holders', help='quem tinha o cargo em um instante')
+    holders.add_argument('--role', type=int, default=ROLE_ID, help='ID do cargo (padrão: representante)')
+    holders.add_argument('--at', required=True, help='instante: data ISO 8601 ou Unix')
+    holders.add_argument('--guild', type=int, help='limitar a uma guild')
+    history = commands.add_parser('history', help='alterações de cargo de um membro')
+    history.add_argument('--member', type=int, required=True)
+    args = parser.parse_args(argv)
+
+    if not journal_files(args.path):
+        print(f"Diário não encontrado: {args.path}", file=sys.stderr)
+        return 1
+
+    if args.command == 'holders':
+        at = _parse_time(args.at)
+        members = sorted(holders_at(args.path, args.role, at, args.guild))
+        print(f"{len(members)} membros com o cargo {args.role} em {datetime.fromtimestamp(at).isoformat()}")
+        print("(só contam as alterações feitas pelo bot desde o início do diário)")
+        for member_id in members:
+            print(member_id)
+    else:
+        for record in iter_records(args.path):
+            if record['member'] == args.member:
+                print(
+                    f"{datetime.fromtimestamp(record['ts']).isoformat(timespec='seconds')}  {record['action']:<6}  "
+                    f"cargo {record['role']}  {record.get('source') or '-'}: {record.get('reason') or '-'}"
+                )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""Fila assíncrona de alterações de cargo com coalescência e limite de taxa"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+
+import discord
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Balde de fichas para espaçar as chamadas de uma rota da API"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate  # Fichas repostas por segundo
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Esperar até haver uma ficha disponível e consumi-la"""
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+
+class RoleOperation:
+    """Estado desejado de um cargo para um membro"""
+
+    __slots__ = ('member', 'role', 'add', 'reason', 'source')
+
+    def __init__(self, member, role, add, reason=None, source=None):
+        self.member = member
+        self.role = role
+        self.add = add
+        self.reason = reason
+        self.source = source  # Quem pediu a alteração (ex.: monitor_status), registrado no diário
+
+
+class RoleOperationQueue:
+    """Fila única para todas as adições/remoções de cargo do bot.
+
+    As operações são indexadas por (guild, membro) e, dentro do membro, por
+    cargo. Uma operação oposta a outra ainda pendente cancela as duas;
+    operações no mesmo sentido são mescladas. Cada guild com operações
+    pendentes tem a sua própria tarefa de drenagem, com o seu balde de fichas
+    (a rota de cargos de membro é limitada por guild), então uma guild
+    limitada não atrasa as outras. As mudanças de um mesmo membro vão em uma
+    única requisição. Cada alteração aplicada vai para o diário de cargos
+    (`journal`), se houver um.
+    """
+
+    def __init__(self, rate=1.0, burst=10, rate_window=60.0, journal=None):
+        self.rate = rate
+        self.burst = burst
+        self.rate_window = rate_window
+        self.journal = journal
+        self._pending = {}  # (guild_id, member_id) -> {role_id: RoleOperation}
+        self._order = {}  # guild_id -> OrderedDict(member_id -> None), na ordem de chegada
+        self._depth = 0
+        self._buckets = {}  # guild_id -> TokenBucket
+        self._workers = {}  # guild_id -> tarefa de drenagem da guild
+        self._running = False
+        self._completed = deque()  # Timestamps das operações aplicadas recentemente
+        self.applied = 0
+        self.failed = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self):
+        """Número de operações aguardando na fila"""
+        return self._depth
+
+    @property
+    def drain_rate(self):
+        """Operações aplicadas por segundo na janela recente"""
+        self._trim_completed(time.monotonic())
+        return len(self._completed) / self.rate_window
+
+    def start(self):
+        self._running = True
+        for guild_id in list(self._order):
+            self._ensure_worker(guild_id)
+
+    async def stop(self):
+        self._running = False
+        workers = list(self._workers.values())
+        self._workers.clear()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def submit(self, member, role, add, reason=None, source=None):
+        """Registrar o estado desejado do cargo; retorna False se cancelou uma operação pendente.
+
+        Quem chama passa o estado desejado sem conferir os cargos do cache: é
+        aqui que uma operação pendente oposta é cancelada (ex.: /clp posto e
+        tirado antes de a fila drenar). Sem operação pendente, um estado que o
+        cache já mostra não entra na fila.
+        """
+        key = (member.guild.id, member.id)
+        ops = self._pending.get(key)
+        pending = ops.get(role.id) if ops else None
+
+        if pending is not None:
+            if pending.add != add:
+                # Adicionar e depois remover (ou o contrário) antes de drenar = nada a fazer
+                del ops[role.id]
+                self._depth -= 1
+                if not ops:
+                    self._forget_member(*key)
+                self.coalesced += 1
+                return False
+            pending.member = member
+            pending.reason = reason or pending.reason
+            pending.source = source or pending.source
+            self.coalesced += 1
+            return True
+
+        if (member.get_role(role.id) is not None) == add:
+            return True  # O cache já está no estado desejado
+        self._enqueue(RoleOperation(member, role, add, reason, source))
+        return True
+
+    def _enqueue(self, op):
+        """Colocar a operação na fila do membro, sem sobrescrever uma operação mais nova no mesmo cargo"""
+        guild_id, member_id = op.member.guild.id, op.member.id
+        ops = self._pending.get((guild_id, member_id))
+        if ops is None:
+            ops = self._pending[(guild_id, member_id)] = {}
+            self._order.setdefault(guild_id, OrderedDict())[member_id] = None
+        if op.role.id in ops:
+            return
+        ops[op.role.id] = op
+        self._depth += 1
+        self._ensure_worker(guild_id)
+
+    def _forget_member(self, guild_id, member_id):
+        del self._pending[(guild_id, member_id)]
+        order = self._order[guild_id]
+        del order[member_id]
+        if not order:
+            del self._order[guild_id]
+
+    def _trim_completed(self, now):
+        while self._completed and now - self._completed[0] > self.rate_window:
+            self._completed.popleft()
+
+    def _bucket_for(self, guild_id):
+        bucket = self._buckets.get(guild_id)
+        if bucket is None:
+            bucket = self._buckets[guild_id] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def _pop_member_batch(self, guild_id):
+        """Retirar todas as operações pendentes do membro mais antigo da guild (O(1))"""
+        order = self._order[guild_id]
+        member_id, _ = order.popitem(last=False)
+        if not order:
+            del self._order[guild_id]
+        batch = list(self._pending.pop((guild_id, member_id)).values())
+        self._depth -= len(batch)
+        return batch
+
+    def _ensure_worker(self, guild_id):
+        if not self._running:
+            return
+        task = self._workers.get(guild_id)
+        if task is None or task.done():
+            self._workers[guild_id] = asyncio.create_task(self._drain_guild(guild_id))
+
+    async def _drain_guild(self, guild_id):
+        """Drenar uma guild até esvaziar; cada requisição espera uma ficha do balde da guild"""
+        bucket = self._bucket_for(guild_id)
+        try:
+            while guild_id in self._order:
+                await bucket.acquire()
+                if guild_id not in self._order:
+                    break  # As operações pendentes se cancelaram enquanto esperávamos
+                await self._apply(self._pop_member_batch(guild_id))
+        finally:
+            if self._workers.get(guild_id) is asyncio.current_task():
+                del self._workers[guild_id]
+
+    def _record(self, ops, ok):
+        for op in ops:
+            if op.add:
+                (metrics.ROLE_ADD_OK if ok else metrics.ROLE_ADD_FAILED).inc()
+            else:
+                (metrics.ROLE_REMOVE_OK if ok else metrics.ROLE_REMOVE_FAILED).inc()
+        if ok:
+            self.applied += len(ops)
+        else:
+            self.failed += len(ops)
+
+    async def _apply(self, batch):
+        member = batch[-1].member
+        # Usar o estado mais recente do cache para não repetir mudanças já aplicadas
+        member = member.guild.get_member(member.id) or member
+        current = set(member.roles)
+        ops = [op for op in batch if (op.role in current) != op.add]
+        if not ops:
+            return
+
+        reason = ops[-1].reason
+        try:
+            if len(ops) == 1:
+                op = ops[0]
+                if op.add:
+                    await member.add_roles(op.role, reason=reason)
+                else:
+                    await member.remove_roles(op.role, reason=reason)
+            else:
+                # Várias mudanças no mesmo membro: uma única requisição PATCH
+                new_roles = current | {op.role for op in ops if op.add}
+                new_roles -= {op.role for op in ops if not op.add}
+                await member.edit(roles=[r for r in new_roles if not r.is_default()], reason=reason)
+        except discord.HTTPException as e:
+            if e.status == 429:
+                # Já contado pelo RateLimitCounter; devolver à fila, a próxima ficha espera o balde se recompor
+                for op in ops:
+                    self._enqueue(op)
+                return
+            self._record(ops, ok=False)
+            if isinstance(e, discord.Forbidden):
+                log.error("❌ Sem permissão para alterar cargos de %s", member.display_name)
+            else:
+                log.error("❌ Erro HTTP ao alterar cargos de %s: %s", member.display_name, e)
+            return
+        except Exception as e:
+            self._record(ops, ok=False)
+            log.exception("❌ Erro ao alterar cargos de %s: %s", member.display_name, e)
+            return
+
+        now = time.monotonic()
+        self._record(ops, ok=True)
+        self._completed.extend([now] * len(ops))
+        self._trim_completed(now)
+        for op in ops:
+            action = 'add' if op.add else 'remove'
+            if self.journal is not None:
+                # O PATCH em lote leva o motivo da última operação; o diário guarda o de cada uma
+                self.journal.append(action, member.guild.id, member.id, op.role.id, op.reason, op.source)
+            log.info(
+                "%s Cargo %s %s %s",
+                '✅' if op.add else '❌', op.role.name, "ADICIONADO para" if op.add else "REMOVIDO de",
+                member.display_name,
+                extra={'member_id': member.id, 'role_id': op.role.id, 'action': action}
+            )
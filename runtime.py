@@ -0,0 +1,34 @@
+"""Modo de alto desempenho (opt-in): loop uvloop no lugar do loop padrão do asyncio"""
+import asyncio
+import logging
+
+from discord import utils
+
+log = logging.getLogger(__name__)
+
+
+def json_decoder():
+    """JSON usado pelo discord.py no gateway e na API: ele escolhe o orjson sozinho quando está instalado"""
+    return 'orjson' if utils.HAS_ORJSON else 'json'
+
+
+def use_uvloop():
+    """Trocar o loop asyncio pelo uvloop; sem o pacote, mantém o loop padrão e retorna False"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def configure_runtime(fast):
+    """Aplicar o modo de alto desempenho antes de o loop ser criado (bot.run); sem `fast`, nada muda"""
+    if not fast:
+        return
+    if use_uvloop():
+        log.info("⚡ Modo de alto desempenho: uvloop ativo, JSON do discord.py: %s", json_decoder())
+    else:
+        log.warning(
+            "⚠️ uvloop não instalado: usando o loop padrão. Instale com pip install -r requirements-speed.txt"
+        )
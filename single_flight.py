@@ -0,0 +1,70 @@
+"""Deduplicação de chamadas concorrentes por chave, com cache curto do resultado"""
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class SingleFlight:
+    """Executa no máximo uma avaliação por chave ao mesmo tempo.
+
+    Chamadas concorrentes com a mesma chave esperam a avaliação em andamento e
+    recebem o mesmo resultado. Depois de pronto, o resultado fica guardado por
+    `ttl` segundos e chamadas repetidas nessa janela são respondidas da memória.
+    """
+
+    def __init__(self, ttl=5.0, max_size=4096):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._inflight = {}  # chave -> asyncio.Future da avaliação em andamento
+        self._results = OrderedDict()  # chave -> (expira_em, resultado), em ordem de expiração
+        self.hits = 0  # Respondidas pelo cache
+        self.shared = 0  # Respondidas por uma avaliação em andamento
+
+    def __len__(self):
+        return len(self._results)
+
+    def forget(self, key):
+        self._results.pop(key, None)
+
+    async def run(self, key, factory):
+        """Retornar o resultado de `factory()` (função assíncrona sem argumentos) para a chave"""
+        now = time.monotonic()
+        self._expire(now)
+        cached = self._results.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached[1]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Marcar como lida caso ninguém esteja esperando
+            raise
+        finally:
+            del self._inflight[key]
+
+        future.set_result(result)
+        if self.ttl > 0:
+            self._results[key] = (time.monotonic() + self.ttl, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        return result
+
+    def _expire(self, now):
+        while self._results:
+            key, (expires, _) = next(iter(self._results.items()))
+            if expires > now:
+                break
+            del self._results[key]
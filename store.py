@@ -0,0 +1,149 @@
+"""Armazenamento persistente (SQLite em modo WAL) dos usuários cadastrados no /clp"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Guild dos cadastros anteriores ao escopo por guild: valem em todas as guilds
+LEGACY_GUILD_ID = 0
+
+
+class ClpStore:
+    """Guarda quem clicou no botão e o último estado /clp conhecido de cada usuário em cada guild.
+
+    Tudo é lido de uma vez na inicialização. Gravações ficam em memória (uma
+    entrada por (guild, usuário), a mais recente vence) e são escritas em lote
+    por uma tarefa periódica, fora do loop do bot.
+    """
+
+    def __init__(self, path, flush_interval=5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._conn = None
+        # A conexão é compartilhada entre as threads do asyncio.to_thread: um acesso ao banco por vez
+        self._db_lock = threading.Lock()
+        self._pending = {}  # (guild_id, user_id) -> (has_clp ou None, updated_at)
+        self._write_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        self._task = None
+
+    def open(self):
+        """Abrir o banco e retornar {(guild_id, user_id): último has_clp (ou None)} em uma única leitura"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._db_lock:
+            return self._open()
+
+    def _open(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS clp_members ('
+            ' guild_id INTEGER NOT NULL,'
+            ' user_id INTEGER NOT NULL,'
+            ' has_clp INTEGER,'
+            ' updated_at REAL NOT NULL,'
+            ' PRIMARY KEY (guild_id, user_id))'
+        )
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        self._conn.commit()
+        self._migrate_clp_users()
+
+        rows = self._conn.execute('SELECT guild_id, user_id, has_clp FROM clp_members').fetchall()
+        return {
+            (guild_id, user_id): None if has_clp is None else bool(has_clp)
+            for guild_id, user_id, has_clp in rows
+        }
+
+    def _migrate_clp_users(self):
+        """Levar a tabela antiga, sem guild, para clp_members com guild_id = LEGACY_GUILD_ID"""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'clp_users'"
+        ).fetchone()
+        if not exists:
+            return
+        with self._conn:
+            moved = self._conn.execute(
+                'INSERT OR IGNORE INTO clp_members (guild_id, user_id, has_clp, updated_at) '
+                'SELECT ?, user_id, has_clp, updated_at FROM clp_users',
+                (LEGACY_GUILD_ID,)
+            ).rowcount
+            self._conn.execute('DROP TABLE clp_users')
+        log.info("🗃️ %d cadastros migrados para a tabela por guild (guild %d = todas)", moved, LEGACY_GUILD_ID)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._task:
+            # Sem cancel(): uma gravação em andamento termina antes da gravação final
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        with self._db_lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    def record(self, guild_id, user_id, has_clp=None):
+        """Registrar um usuário de uma guild (e opcionalmente seu estado /clp) para a próxima gravação em lote"""
+        self._pending[(guild_id, user_id)] = (has_clp, time.time())
+
+    async def flush(self):
+        if not self._pending or self._conn is None:
+            return
+        async with self._write_lock:
+            batch, self._pending = self._pending, {}
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except sqlite3.Error as e:
+                log.error("❌ Erro ao gravar %d usuários no banco: %s", len(batch), e)
+                # Devolver o lote sem sobrescrever registros mais novos
+                for key, entry in batch.items():
+                    self._pending.setdefault(key, entry)
+
+    def get_meta(self, key):
+        """Ler um valor avulso (ex.: hash dos comandos); chamada bloqueante, use em asyncio.to_thread"""
+        with self._db_lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        """Gravar um valor avulso; chamada bloqueante, use em asyncio.to_thread"""
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO meta (key, value) VALUES (?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+                (key, value)
+            )
+
+    def _write(self, batch):
+        rows = [
+            (guild_id, user_id, None if has_clp is None else int(has_clp), updated_at)
+            for (guild_id, user_id), (has_clp, updated_at) in batch.items()
+        ]
+        with self._db_lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO clp_members (guild_id, user_id, has_clp, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(guild_id, user_id) DO UPDATE SET'
+                ' has_clp = COALESCE(excluded.has_clp, clp_members.has_clp),'
+                ' updated_at = excluded.updated_at',
+                rows
+            )
+
+    async def _flush_loop(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                await self.flush()
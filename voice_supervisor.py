@@ -0,0 +1,134 @@
+"""Supervisor da conexão de voz: uma única tarefa que mantém o bot no canal configurado"""
+import asyncio
+import logging
+import random
+import time
+
+import discord
+
+import metrics
+
+log = logging.getLogger(__name__)
+
+
+class VoiceSupervisor:
+    """Mantém o bot conectado a um canal de voz, sem nunca desistir.
+
+    Uma só tarefa verifica o `voice_client` da guild a cada `probe_interval`
+    segundos ou quando acordada por wake() (on_ready, on_voice_state_update), e
+    reconecta com backoff exponencial com jitter limitado a `max_delay`. Como
+    só essa tarefa conecta, nunca há duas tentativas ao mesmo tempo.
+    """
+
+    def __init__(self, bot, channel_id, base_delay=1.0, max_delay=60.0, probe_interval=30.0, connect_timeout=15.0):
+        self.bot = bot
+        self.channel_id = channel_id
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.probe_interval = probe_interval
+        self.connect_timeout = connect_timeout
+        self.attempts = 0  # Tentativas seguidas sem sucesso
+        self.down_since = None  # time.monotonic() de quando a conexão caiu
+        self.last_recovery = None  # Segundos que levou a última recuperação
+        self._wake = asyncio.Event()
+        self._task = None
+        self._connected_gauge = metrics.VOICE_CONNECTED.labels(str(channel_id))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self):
+        """Pedir uma verificação imediata (não interrompe um backoff em andamento)"""
+        self._wake.set()
+
+    def is_connected(self):
+        channel = self.bot.get_channel(self.channel_id)
+        if not isinstance(channel, discord.VoiceChannel):
+            return False
+        voice_client = channel.guild.voice_client
+        return bool(
+            voice_client
+            and voice_client.is_connected()
+            and voice_client.channel
+            and voice_client.channel.id == self.channel_id
+        )
+
+    def backoff(self):
+        """Atraso da próxima tentativa: sorteado até o teto exponencial, limitado a max_delay"""
+        # Expoente limitado: sem isso, após ~1000 falhas 2 ** n não cabe em float e derruba o supervisor
+        ceiling = min(self.max_delay, self.base_delay * 2 ** min(self.attempts - 1, 30))
+        return random.uniform(self.base_delay / 2, ceiling)
+
+    async def _connect(self):
+        channel = self.bot.get_channel(self.channel_id)
+        if not isinstance(channel, discord.VoiceChannel):
+            raise RuntimeError(f"Canal de voz {self.channel_id} não encontrado")
+
+        voice_client = channel.guild.voice_client
+        if voice_client:
+            if voice_client.is_connected():
+                # Conectado a outro canal da mesma guild: só mover
+                await voice_client.move_to(channel)
+                return
+            # Cliente antigo que perdeu a conexão: descartar antes de conectar de novo
+            await voice_client.disconnect(force=True)
+
+        await channel.connect(timeout=self.connect_timeout, reconnect=False)
+
+    async def _wait(self, timeout):
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            if self.is_connected():
+                self._connected_gauge.set(1)
+                if self.down_since is not None:
+                    self.last_recovery = time.monotonic() - self.down_since
+                    metrics.VOICE_RECOVERY_SECONDS.observe(self.last_recovery)
+                    log.info(
+                        "✅ Conectado ao canal de voz após %.1fs (%d tentativas falhas)",
+                        self.last_recovery, self.attempts
+                    )
+                    self.down_since = None
+                    self.attempts = 0
+                await self._wait(self.probe_interval)
+                continue
+
+            self._connected_gauge.set(0)
+            if self.down_since is None:
+                self.down_since = time.monotonic()
+                log.warning("🔌 Bot fora do canal de voz, reconectando...")
+
+            metrics.VOICE_RECONNECT_ATTEMPTS.inc()
+            try:
+                await self._connect()
+                if self.is_connected():
+                    continue  # A próxima volta registra o tempo de recuperação
+                error = "conexão não confirmada"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e) or type(e).__name__
+
+            self.attempts += 1
+            delay = self.backoff()
+            log.warning(
+                "❌ Falha ao conectar ao canal de voz (tentativa %d): %s; nova tentativa em %.1fs",
+                self.attempts, error, delay
+            )
+            await asyncio.sleep(delay)
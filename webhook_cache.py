@@ -0,0 +1,64 @@
+"""Cache por canal dos webhooks usados pelo /avs"""
+import asyncio
+import logging
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+
+class WebhookCache:
+    """Cache LRU limitado de webhooks do bot, carregado sob demanda.
+
+    As entradas são descartadas em on_webhooks_update ou quando um envio
+    retorna 404 (webhook apagado por alguém).
+    """
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self._webhooks = OrderedDict()  # channel_id -> discord.Webhook
+        self._locks = {}  # channel_id -> asyncio.Lock (evita criar dois webhooks no mesmo canal)
+
+    def __len__(self):
+        return len(self._webhooks)
+
+    async def get(self, canal, bot_user):
+        """Obter o webhook do bot no canal, buscando ou criando apenas na primeira vez"""
+        webhook = self._webhooks.get(canal.id)
+        if webhook is not None:
+            self._webhooks.move_to_end(canal.id)
+            return webhook
+
+        lock = self._locks.setdefault(canal.id, asyncio.Lock())
+        async with lock:
+            # Outro envio pode ter carregado o webhook enquanto esperávamos
+            webhook = self._webhooks.get(canal.id)
+            if webhook is not None:
+                return webhook
+
+            for wh in await canal.webhooks():
+                if wh.user == bot_user:
+                    webhook = wh
+                    break
+
+            if not webhook:
+                webhook = await canal.create_webhook(
+                    name="AVS Webhook",
+                    reason="Webhook criado pelo comando /avs"
+                )
+                log.info("✅ Webhook criado no canal %s", canal.name)
+
+            self._store(canal.id, webhook)
+
+        if not lock.locked():
+            self._locks.pop(canal.id, None)
+        return webhook
+
+    def invalidate(self, channel_id):
+        """Descartar o webhook em cache de um canal"""
+        self._webhooks.pop(channel_id, None)
+
+    def _store(self, channel_id, webhook):
+        self._webhooks[channel_id] = webhook
+        self._webhooks.move_to_end(channel_id)
+        while len(self._webhooks) > self.max_size:
+            self._webhooks.popitem(last=False)
@@ -0,0 +1,60 @@
+"""Pool de workers asyncio com fila limitada"""
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """Executa tarefas em segundo plano com um número fixo de workers.
+
+    A fila é limitada: submit() recusa novas tarefas quando ela está cheia, em
+    vez de acumular trabalho sem fim enquanto o loop do gateway espera.
+    """
+
+    def __init__(self, name, workers=2, max_queue=20):
+        self.name = name
+        self.workers = workers
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._tasks = []
+        self.active = 0  # Tarefas em execução neste momento
+
+    @property
+    def depth(self):
+        """Tarefas aguardando um worker livre"""
+        return self._queue.qsize()
+
+    def start(self):
+        if self._tasks:
+            return
+        # Nomes como avs-worker-0 identificam o worker nos alertas do watchdog do loop
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job):
+        """Enfileirar uma função assíncrona sem argumentos; retorna False se a fila estiver cheia"""
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self.active += 1
+            try:
+                await job()
+            except Exception as e:
+                log.exception("❌ Erro em tarefa do pool %s: %s", self.name, e)
+            finally:
+                self.active -= 1
+                self._queue.task_done()